@@ -12,7 +12,8 @@ ENCODING = 'utf-8'
 CRAWLER_THREAD_COUNT = 2
 PAGE_LOAD_TIMEOUT = 10
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-MAX_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 20  # per site, across all result pages
+SEARCH_PAGE_DEPTH = 3
 
 # --- Search Patterns ---
 SEARCH_PATTERNS = {
@@ -22,4 +23,40 @@ SEARCH_PATTERNS = {
 
 # --- File Paths ---
 OUTPUT_IMAGE_NAME = "comparison_analysis.png"
-FINAL_CSV_NAME = "comparison_report.csv"
\ No newline at end of file
+FINAL_CSV_NAME = "comparison_report.csv"
+
+# --- Raw Page Archive ---
+ARCHIVE_RAW_PAGES = True
+ARCHIVE_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+REPARSE_WORKERS = None  # None = one process per CPU core
+
+# --- Distributed Crawl ---
+CRAWL_MODE = 'local'  # 'local' = in-process threads, 'distributed' = work queue broker + worker.py
+WORK_QUEUE_PATH = 'data/queue/work_queue.sqlite'  # server-side, on local disk; workers go through the broker
+WORK_BROKER_HOST = '127.0.0.1'  # server: interface to listen on ('0.0.0.0' for remote workers); worker: server address
+WORK_BROKER_PORT = 9081
+WORK_BROKER_TOKEN = ''  # shared secret workers must send ('' = no check)
+WORK_LEASE_SECONDS = 120
+WORK_MAX_ATTEMPTS = 3
+WORKER_POLL_INTERVAL = 1.0
+DISTRIBUTED_JOB_TIMEOUT = 900
+
+# --- Report Queries ---
+REPORT_CACHE_SIZE = 16  # ranked reports of the most recent jobs kept in server memory
+
+# --- Logging ---
+LOG_MODE = 'queue'  # 'queue' = background writer thread, 'sync' = direct console handler
+LOG_FILE = 'logs/{role}.log'  # per-process rotating file (queue mode, server/worker/re-parse only; '' to disable)
+LOG_JSON = False  # write the log file as JSON lines
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+# --- Service Mode & Startup ---
+BROWSER_POOL_SIZE = CRAWLER_THREAD_COUNT  # idle Chrome instances kept per scraper profile in service mode
+SERVICE_PREWARM_BROWSERS = 1  # drivers started per profile before the service accepts requests
+FX_RATE_TTL = 600  # seconds a fetched USD/IRR rate is reused
+IMPORT_TIME_BUDGET_MS = {
+    "src.client.main_client": 100,
+    "src.server.main_server": 200,
+    "src.server.worker": 150,
+}
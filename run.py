@@ -8,8 +8,10 @@ def main():
     print("Welcome to Competitive Pricing Intelligence System")
     print("1. Run Server (Crawler & Analyzer)")
     print("2. Run Client (Dashboard & Monitor)")
+    print("3. Re-parse Archived Pages (Offline)")
+    print("4. Run Server as Preloaded Service (Warm Browsers & Modules)")
     
-    choice = input("Select an option (1/2): ").strip()
+    choice = input("Select an option (1/2/3/4): ").strip()
     
     if choice == '1':
         print("Starting Server...")
@@ -20,6 +22,14 @@ def main():
         print("Starting Client...")
         from src.client.main_client import start_client_app
         start_client_app()
+    elif choice == '3':
+        print("Re-parsing archived pages...")
+        from src.server.core.reparse import start_reparse_app
+        start_reparse_app()
+    elif choice == '4':
+        print("Starting Preloaded Service...")
+        from src.server.main_server import start_service_app
+        start_service_app()
     else:
         print("Invalid choice. Exiting.")
 
@@ -2,8 +2,8 @@ import socket
 import sys
 import os
 import json
-import pandas as pd
 import subprocess
+from typing import Any, Dict
 from src.common.logger import setup_logger
 from config.settings import SERVER_HOST, SERVER_PORT, BUFFER_SIZE, ENCODING
 
@@ -13,6 +13,35 @@ def open_file(filepath):
     if sys.platform == "win32": os.startfile(filepath)
     else: subprocess.call(["xdg-open", filepath])
 
+def query_report(job_id: str, **params: Any) -> Dict[str, Any]:
+    """
+    Fetches a slice of a job's ranked report from the server.
+
+    Args:
+        job_id (str): Job id returned by the server with the report.
+        **params: op ('top' / 'page' / 'filter') plus its options, e.g.
+            n=5, page=2, page_size=20, source='amazon', min_price=..., text='pro'.
+    """
+    request = {"action": "query", "job_id": job_id, **params}
+    conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        conn.connect((SERVER_HOST, SERVER_PORT))
+        conn.sendall(json.dumps(request).encode(ENCODING))
+        raw = b""
+        while True:
+            chunk = conn.recv(BUFFER_SIZE)
+            if not chunk: break
+            raw += chunk
+    finally:
+        conn.close()
+    return json.loads(raw.decode(ENCODING))
+
+def print_rows(rows) -> None:
+    # Show name, price and source. Link is in CSV but too long for simple print
+    for i, row in enumerate(rows, 1):
+        name = str(row.get('product_name', ''))[:50]
+        print(f"{i:>2}. {name:<50} {row.get('final_price', 0):>16,.0f} IRR  {row.get('source', '')}")
+
 def start_client_app() -> None:
     print("\n--- Global Price Comparison System ---")
     query = input("What product do you want to compare? (e.g. iPhone 13): ").strip()
@@ -29,21 +58,13 @@ def start_client_app() -> None:
         print(f"\n[SERVER] {client.recv(BUFFER_SIZE).decode(ENCODING)}")
         print("Gathering data... (This takes about 60-90 seconds)\n")
         
-        report_path = client.recv(BUFFER_SIZE).decode(ENCODING)
-        if "ERROR" in report_path:
-            print(f"Server Error: {report_path}")
+        reply = client.recv(BUFFER_SIZE).decode(ENCODING)
+        if reply.startswith("ERROR"):
+            print(f"Server Error: {reply}")
             return
 
-        print(f"\nReport Saved: {report_path}")
-        if os.path.exists(report_path):
-            df = pd.read_csv(report_path)
-            print("\n--- Top 5 Deals ---")
-            # Show name, price and source. Link is in CSV but too long for simple print
-            cols_to_show = [c for c in ['product_name', 'final_price', 'source'] if c in df.columns]
-            if cols_to_show:
-                print(df[cols_to_show].head(5))
-            else:
-                print("Data format unexpected.")
+        job = json.loads(reply)
+        print(f"\nReport Saved: {job['report_path']} ({job['rows']} rows, job {job['job_id']})")
 
         client.send("ACK".encode(ENCODING))
         
@@ -54,9 +75,18 @@ def start_client_app() -> None:
             img_data += chunk
             
         with open("comparison_result.png", "wb") as f: f.write(img_data)
+
+        # The server is free again; fetch only the rows we display
+        top = query_report(job['job_id'], op="top", n=5)
+        if "error" in top:
+            print(f"Server Error: {top['error']}")
+        else:
+            print("\n--- Top 5 Deals ---")
+            print_rows(top['rows'])
+
         open_file("comparison_result.png")
 
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
     finally:
         client.close()
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Import-time budget check.
+
+Imports each entry-point module in a fresh interpreter, measures the time
+spent and reports which heavy third-party packages were pulled in. Fails
+(exit code 1) if any module exceeds its budget in IMPORT_TIME_BUDGET_MS.
+
+Usage:
+    python -m src.common.import_budget
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from config.settings import IMPORT_TIME_BUDGET_MS
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+HEAVY_MODULES = ("pandas", "matplotlib", "selenium", "bs4", "requests", "deep_translator")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"ms": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Imports `module` in a clean subprocess and returns {'ms': float, 'heavy': [...]}."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    failed = False
+    for module, budget in IMPORT_TIME_BUDGET_MS.items():
+        try:
+            result = measure_import(module)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<28} import failed:\n{e.stderr}")
+            failed = True
+            continue
+        over = result["ms"] > budget
+        failed |= over
+        heavy = ", ".join(result["heavy"]) or "none"
+        status = "OVER" if over else "ok"
+        print(f"{module:<28} {result['ms']:7.1f} ms / {budget} ms  [{status}]  heavy modules: {heavy}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
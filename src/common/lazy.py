@@ -0,0 +1,64 @@
+"""
+Lazy import helpers.
+
+Heavy third-party modules (pandas, matplotlib, selenium, bs4, requests,
+deep_translator) are bound to module-level proxies and only imported on
+first attribute access or call, keeping them off the startup path of the
+client, the worker and the server's accept loop.
+"""
+
+import importlib
+import threading
+from typing import Any, Optional
+
+
+class LazyImport:
+    """
+    Stand-in for a module (or an attribute of a module) that imports it on first use.
+
+    Attribute access and calls are forwarded to the real object, so
+    `pd = lazy_import("pandas")` and `pd.DataFrame(...)` read as usual.
+    """
+
+    __slots__ = ('_module_name', '_attr', '_target', '_lock')
+
+    def __init__(self, module_name: str, attr: Optional[str] = None):
+        object.__setattr__(self, '_module_name', module_name)
+        object.__setattr__(self, '_attr', attr)
+        object.__setattr__(self, '_target', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def load(self) -> Any:
+        """Imports and returns the real object."""
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = importlib.import_module(self._module_name)
+                    if self._attr:
+                        target = getattr(target, self._attr)
+                    object.__setattr__(self, '_target', target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        name = f"{self._module_name}.{self._attr}" if self._attr else self._module_name
+        state = 'loaded' if self._target is not None else 'not loaded'
+        return f"<lazy {name} ({state})>"
+
+
+def lazy_import(module_name: str, attr: Optional[str] = None) -> LazyImport:
+    """
+    Returns a proxy for `module_name` (or `module_name.attr`) that is imported on first use.
+
+    Examples:
+        pd = lazy_import("pandas")
+        BeautifulSoup = lazy_import("bs4", "BeautifulSoup")
+    """
+    return LazyImport(module_name, attr)
@@ -0,0 +1,107 @@
+"""
+Logging micro-benchmark.
+
+Measures how long 50 concurrent threads spend inside logging calls with the
+synchronous console handler versus the queue handler + background writer,
+and the cost of eager f-string formatting for filtered (DEBUG) messages.
+Output goes to os.devnull so terminal speed does not skew the numbers.
+
+Usage:
+    python -m src.common.log_bench [records_per_thread]
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+from src.common.logger import DeferredQueueHandler, _TEXT_FORMAT, _DATE_FORMAT
+
+THREADS = 50
+
+
+def _devnull_handler() -> logging.Handler:
+    handler = logging.StreamHandler(open(os.devnull, 'w'))
+    handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
+
+def _run_threads(target, per_thread: int) -> float:
+    start_gate = threading.Barrier(THREADS + 1)
+    threads = [threading.Thread(target=lambda: (start_gate.wait(), target(per_thread))) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    began = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - began
+
+
+def _bench(logger: logging.Logger, per_thread: int) -> float:
+    def work(n):
+        for i in range(n):
+            logger.info("[AMAZON] Scraped: %s... - $%s", "Apple iPhone 13 Pro Max", i)
+    return _run_threads(work, per_thread)
+
+
+def bench_sync(per_thread: int) -> float:
+    logger = logging.getLogger("bench.sync")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(_devnull_handler())
+    return _bench(logger, per_thread)
+
+
+def bench_queue(per_thread: int) -> tuple:
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, _devnull_handler())
+    logger = logging.getLogger("bench.queue")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+
+    listener.start()
+    producers = _bench(logger, per_thread)
+    began = time.perf_counter()
+    listener.stop()  # drains the queue
+    return producers, producers + (time.perf_counter() - began)
+
+
+def bench_filtered(per_thread: int) -> tuple:
+    logger = logging.getLogger("bench.filtered")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    title, price = "Apple iPhone 13 Pro Max", 1234.5
+
+    def eager(n):
+        for _ in range(n):
+            logger.debug(f"[AMAZON] Scraped: {title[:15]}... - ${price}")
+
+    def lazy(n):
+        for _ in range(n):
+            logger.debug("[AMAZON] Scraped: %s... - $%s", title, price)
+
+    return _run_threads(eager, per_thread), _run_threads(lazy, per_thread)
+
+
+def main(per_thread: int = 2000) -> None:
+    total = THREADS * per_thread
+    print(f"{THREADS} threads x {per_thread} records = {total:,} records")
+
+    sync_time = bench_sync(per_thread)
+    print(f"sync StreamHandler : {sync_time:7.3f}s in threads  ({total / sync_time:>10,.0f} rec/s)")
+
+    producers, drained = bench_queue(per_thread)
+    print(f"queue + listener   : {producers:7.3f}s in threads  ({total / producers:>10,.0f} rec/s), "
+          f"{drained:.3f}s until fully written")
+
+    eager, lazy = bench_filtered(per_thread)
+    print(f"filtered DEBUG     : eager f-string {eager:.3f}s vs lazy args {lazy:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,26 +1,192 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from config.settings import LOG_MODE, LOG_FILE, LOG_JSON, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+_TEXT_FORMAT = '%(asctime)s - %(levelname)s - [%(name)s]: %(message)s'
+_DATE_FORMAT = '%H:%M:%S'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["_ProcessQueueHandler"] = None
+_file_role: Optional[str] = None
+_stopped = False
+_listener_lock = threading.Lock()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler renders the message in the calling thread; here the
+    record is queued with its msg/args untouched, so the crawler thread only
+    pays for building the record. Tracebacks are rendered up front because
+    they reference live frames.
+
+    In a forked child `direct` is set and records bypass the queue (see
+    _log_directly_in_child).
+    """
+
+    direct: Optional[logging.Handler] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        direct = self.direct
+        if direct is None:
+            super().emit(record)
+        elif record.levelno >= direct.level:
+            direct.handle(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _ProcessQueueHandler(DeferredQueueHandler):
+    """The process-wide queue handler; starts the background writer on the first record."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener is None and self.direct is None:
+            _start_listener()
+        super().emit(record)
+
+
+def _console_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
+
+def _file_handler(role: str) -> logging.Handler:
+    path = BASE_DIR / LOG_FILE.format(role=role)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+    )
+    handler.setLevel(logging.INFO)
+    if LOG_JSON:
+        handler.setFormatter(JsonLineFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+    return handler
+
+
+def get_queue_handler() -> logging.Handler:
+    """
+    Returns the process-wide queue handler. Creating it is cheap: the
+    background writer thread only starts when the first record is logged.
+    """
+    global _queue_handler
+    with _listener_lock:
+        if _queue_handler is None:
+            _queue_handler = _ProcessQueueHandler(queue.SimpleQueue())
+        return _queue_handler
+
+
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None or _stopped or _queue_handler is None:
+            return
+        handlers = [_console_handler()]
+        if _file_role and LOG_FILE:
+            handlers.append(_file_handler(_file_role))
+        _listener = logging.handlers.QueueListener(
+            _queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def enable_file_logging(role: str) -> None:
+    """
+    Also writes this process's records to its own rotating file, LOG_FILE with
+    `role` filled in (e.g. logs/server.log, logs/worker-4242.log). Called by
+    the entry points; processes that never call it log to the console only,
+    so no two processes append to or rotate the same file.
+    """
+    global _file_role
+    with _listener_lock:
+        if _file_role is not None or not LOG_FILE or LOG_MODE != 'queue':
+            return
+        _file_role = role
+        if _listener is not None:
+            # Writer already running: the listener reads its handlers tuple per record
+            _listener.handlers = _listener.handlers + (_file_handler(role),)
+
+
+def _log_directly_in_child() -> None:
+    # A forked child (e.g. the re-parse process pool) inherits the queue handler but
+    # not the writer thread. A writer thread of its own would lose records, since
+    # pool workers exit without running atexit, and would share the parent's
+    # rotating file. The child therefore logs synchronously, to the console only.
+    global _listener, _listener_lock, _file_role
+    _listener_lock = threading.Lock()
+    _listener = None
+    _file_role = None
+    if _queue_handler is not None:
+        _queue_handler.direct = _console_handler()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_log_directly_in_child)
+
+
+def stop_logging() -> None:
+    """Flushes queued records and stops the background writer."""
+    global _listener, _stopped
+    with _listener_lock:
+        _stopped = True
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
 
 def setup_logger(name: str) -> logging.Logger:
     """
     Sets up a logger with a standard format for the entire application.
     Output format: [Time] [Level] [Module]: Message
+
+    With LOG_MODE = 'queue', records go through a shared queue to a background
+    writer instead of blocking the calling thread on console/file I/O.
     """
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        
-        # Create console handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - [%(name)s]: %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
-    return logger
\ No newline at end of file
+
+        if LOG_MODE == 'queue':
+            logger.addHandler(get_queue_handler())
+        else:
+            logger.addHandler(_console_handler())
+
+    return logger
@@ -1,31 +1,50 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
+from src.common.lazy import lazy_import
 from src.server.core.finance import get_current_usd_rate, calculate_landed_cost
 from config.settings import FINAL_CSV_NAME, OUTPUT_IMAGE_NAME
 
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+
 logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 DATA_DIR = BASE_DIR / 'data' / 'processed'
 LOGS_DIR = BASE_DIR / 'logs'
 
-def analyze_purchase_options() -> str:
+def build_purchase_report(frames: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """
+    Merges the per-site results into one report ranked by final cost in IRR.
+    Returns an empty DataFrame if there is nothing to compare.
+
+    Args:
+        frames (Dict): site -> DataFrame of that site's records (e.g. from
+            RecordBatch.to_dataframe()). Read from the per-site CSVs if omitted.
+    """
     df_digikala = pd.DataFrame()
     df_amazon = pd.DataFrame()
     
-    try:
-        if (DATA_DIR / "digikala.csv").exists():
-            df_digikala = pd.read_csv(DATA_DIR / "digikala.csv")
-        if (DATA_DIR / "amazon.csv").exists():
-            df_amazon = pd.read_csv(DATA_DIR / "amazon.csv")
-    except Exception as e:
-        logger.error(f"Error loading CSVs: {e}")
+    if frames is not None:
+        # Shallow copies: the columns added below must not leak into the caller's frames
+        if frames.get("digikala") is not None:
+            df_digikala = frames["digikala"].copy(deep=False)
+        if frames.get("amazon") is not None:
+            df_amazon = frames["amazon"].copy(deep=False)
+    else:
+        try:
+            if (DATA_DIR / "digikala.csv").exists():
+                df_digikala = pd.read_csv(DATA_DIR / "digikala.csv")
+            if (DATA_DIR / "amazon.csv").exists():
+                df_amazon = pd.read_csv(DATA_DIR / "amazon.csv")
+        except Exception as e:
+            logger.error("Error loading CSVs: %s", e)
 
     if df_digikala.empty and df_amazon.empty:
-        return ""
+        return pd.DataFrame()
 
     current_rate = get_current_usd_rate()
 
@@ -47,7 +66,7 @@ def analyze_purchase_options() -> str:
 
     # Combine
     df_final = pd.concat([df_digikala, df_amazon], ignore_index=True)
-    if df_final.empty: return ""
+    if df_final.empty: return pd.DataFrame()
 
     df_final = df_final.sort_values(by='final_price_irr')
     
@@ -64,12 +83,21 @@ def analyze_purchase_options() -> str:
     else:
         export_df['product_link'] = "N/A"
 
+    return export_df
+
+def save_purchase_report(export_df: pd.DataFrame) -> str:
+    """Writes the ranked report to the final CSV. Returns its path, or "" if empty."""
+    if export_df.empty: return ""
+
     output_path = DATA_DIR / FINAL_CSV_NAME
     export_df.to_csv(output_path, index=False, encoding='utf-8-sig')
-    logger.info(f"Report saved to {output_path}")
+    logger.info("Report saved to %s", output_path)
     
     return str(output_path)
 
+def analyze_purchase_options(frames: Optional[Dict[str, pd.DataFrame]] = None) -> str:
+    return save_purchase_report(build_purchase_report(frames))
+
 def generate_comparison_plot() -> Optional[str]:
     final_path = DATA_DIR / FINAL_CSV_NAME
     if not final_path.exists(): return None
@@ -97,5 +125,5 @@ def generate_comparison_plot() -> Optional[str]:
         plt.close()
         return str(output_path)
     except Exception as e:
-        logger.error(f"Plot generation failed: {e}")
+        logger.error("Plot generation failed: %s", e)
         return None
\ No newline at end of file
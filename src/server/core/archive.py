@@ -0,0 +1,227 @@
+"""
+Raw Page Archive Module.
+
+Stores fetched HTML in compressed, content-addressed segment files so pages can
+be re-parsed offline when selectors change. Each page body is keyed by its
+SHA-256 digest and written once; every fetch (url + time) points at a digest.
+The index lives in a small SQLite database next to the segments.
+"""
+
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from src.common.logger import setup_logger
+from config.settings import ARCHIVE_SEGMENT_MAX_BYTES
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+logger = setup_logger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+ARCHIVE_DIR = BASE_DIR / 'data' / 'raw'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest  TEXT PRIMARY KEY,
+    segment TEXT NOT NULL,
+    offset  INTEGER NOT NULL,
+    length  INTEGER NOT NULL,
+    codec   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    site       TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    digest     TEXT NOT NULL REFERENCES blobs(digest)
+);
+CREATE INDEX IF NOT EXISTS idx_fetches_url ON fetches(url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_fetches_site ON fetches(site, fetched_at);
+"""
+
+
+class ArchivedPage(NamedTuple):
+    """Index entry of one archived fetch (without the body)."""
+    site: str
+    url: str
+    fetched_at: float
+    segment: str
+    offset: int
+    length: int
+    codec: str
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Archive segment is zstd-compressed but 'zstandard' is not installed.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_page(root: Path, entry: ArchivedPage) -> str:
+    """
+    Reads and decompresses a single archived page body.
+    Only needs the index entry, so it is cheap to call from worker processes.
+    """
+    with open(Path(root) / entry.segment, 'rb') as f:
+        f.seek(entry.offset)
+        blob = f.read(entry.length)
+    return _decompress(blob, entry.codec).decode('utf-8')
+
+
+class PageArchive:
+    """
+    Append-only, content-addressed store for raw HTML pages.
+
+    Page bodies are compressed individually and appended to the current
+    segment file; a segment is closed once it grows past
+    ARCHIVE_SEGMENT_MAX_BYTES. Identical bodies are stored only once.
+    Safe to share between crawler threads and between processes (e.g. several
+    crawl workers): each append runs inside an IMMEDIATE transaction on the
+    index, which serializes writers across processes.
+    """
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.codec = 'zstd' if zstandard is not None else 'gzip'
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / 'index.sqlite'), timeout=30,
+                                   isolation_level=None, check_same_thread=False)
+        # WAL: a long re-parse reading the index must not block store() from committing
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _current_segment(self) -> Path:
+        # Re-evaluated under the index lock: another process may have rolled over to a new segment
+        suffix = '.zst' if self.codec == 'zstd' else '.gz'
+        existing = sorted(self.root.glob(f'segment-*{suffix}'))
+        if existing and existing[-1].stat().st_size < ARCHIVE_SEGMENT_MAX_BYTES:
+            return existing[-1]
+        return self.root / f'segment-{len(existing):05d}{suffix}'
+
+    def store(self, site: str, url: str, html: str) -> str:
+        """
+        Archives a fetched page and records the fetch in the index.
+
+        Returns:
+            str: The SHA-256 digest of the page body.
+        """
+        body = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+
+        blob = _compress(body, self.codec)
+
+        with self._lock:
+            # Holds the index write lock across processes until COMMIT, so the segment
+            # offset read below cannot be invalidated by another process's append.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                known = self._db.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+                if not known:
+                    segment = self._current_segment()
+                    with open(segment, 'ab') as f:
+                        f.seek(0, 2)
+                        offset = f.tell()
+                        f.write(blob)
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO blobs (digest, segment, offset, length, codec) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (digest, segment.name, offset, len(blob), self.codec)
+                    )
+                self._db.execute(
+                    "INSERT INTO fetches (site, url, fetched_at, digest) VALUES (?, ?, ?, ?)",
+                    (site, url, time.time(), digest)
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return digest
+
+    def iter_entries(self, site: Optional[str] = None, since: Optional[float] = None,
+                     latest_only: bool = True) -> Iterator[ArchivedPage]:
+        """
+        Streams index entries ordered by fetch time.
+
+        Args:
+            site (str): Restrict to one site ('digikala' / 'amazon').
+            since (float): Only fetches at or after this UNIX timestamp.
+            latest_only (bool): Yield only the most recent fetch of each URL.
+        """
+        where, params = [], []
+        if site:
+            where.append("f.site = ?")
+            params.append(site)
+        if since is not None:
+            where.append("f.fetched_at >= ?")
+            params.append(since)
+        if latest_only:
+            where.append("f.id = (SELECT MAX(id) FROM fetches WHERE url = f.url)")
+        sql = (
+            "SELECT f.site, f.url, f.fetched_at, b.segment, b.offset, b.length, b.codec "
+            "FROM fetches f JOIN blobs b ON b.digest = f.digest"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY f.fetched_at"
+
+        # A separate connection keeps the cursor independent from concurrent store() calls
+        db = sqlite3.connect(str(self.root / 'index.sqlite'))
+        try:
+            for row in db.execute(sql, params):
+                yield ArchivedPage(*row)
+        finally:
+            db.close()
+
+    def get(self, url: str) -> Optional[str]:
+        """Returns the most recently archived body for a URL, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT f.site, f.url, f.fetched_at, b.segment, b.offset, b.length, b.codec "
+                "FROM fetches f JOIN blobs b ON b.digest = f.digest "
+                "WHERE f.url = ? ORDER BY f.fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+        return read_page(self.root, ArchivedPage(*row)) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_archive: Optional[PageArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> PageArchive:
+    """Returns the process-wide archive, creating it on first use."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
+
+
+def archive_page(site: str, url: str, html: str) -> None:
+    """
+    Best-effort hook for the scrapers: archiving must never break a crawl.
+    """
+    try:
+        get_archive().store(site, url, html)
+    except Exception as e:
+        logger.warning("[ARCHIVE] Could not archive %s: %s", url, e)
@@ -0,0 +1,82 @@
+"""
+Browser Pool Module.
+
+By default every scrape starts and quits its own Chrome instance. In service
+mode the pool is enabled: drivers are created ahead of time (prewarm) and
+handed back after each page instead of being quit, so a request does not pay
+Chrome's start-up cost.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List
+
+from src.common.logger import setup_logger
+from config.settings import BROWSER_POOL_SIZE
+
+logger = setup_logger(__name__)
+
+_idle: Dict[str, List[Any]] = {}
+_lock = threading.Lock()
+_enabled = False
+
+
+def enable_driver_pool() -> None:
+    global _enabled
+    _enabled = True
+
+
+def acquire_driver(profile: str, factory: Callable[[], Any]) -> Any:
+    """
+    Returns an idle pooled driver for `profile`, or a new one from `factory`.
+
+    Args:
+        profile (str): Pool key; drivers are only reused within the same profile
+            because each scraper configures Chrome differently.
+        factory (Callable): Creates a new driver when none is idle.
+    """
+    if _enabled:
+        with _lock:
+            idle = _idle.get(profile)
+            if idle:
+                return idle.pop()
+    return factory()
+
+
+def release_driver(profile: str, driver: Any, healthy: bool = True) -> None:
+    """Returns a driver to the pool, or quits it (pool disabled, full, or driver broken)."""
+    if _enabled and healthy:
+        with _lock:
+            idle = _idle.setdefault(profile, [])
+            if len(idle) < BROWSER_POOL_SIZE:
+                idle.append(driver)
+                return
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def prewarm_drivers(profile: str, factory: Callable[[], Any], count: int = 1) -> None:
+    """Starts `count` drivers for a profile and parks them in the pool."""
+    enable_driver_pool()
+    for _ in range(count):
+        try:
+            release_driver(profile, factory())
+        except Exception as e:
+            logger.warning("[BROWSER] Could not prewarm %s driver: %s", profile, e)
+            return
+    logger.info("[BROWSER] Prewarmed %s %s driver(s).", count, profile)
+
+
+def shutdown_driver_pool() -> None:
+    """Quits every idle pooled driver."""
+    global _enabled
+    with _lock:
+        drivers = [d for idle in _idle.values() for d in idle]
+        _idle.clear()
+        _enabled = False
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception:
+            pass
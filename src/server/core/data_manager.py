@@ -1,7 +1,12 @@
-import pandas as pd
+from __future__ import annotations
+
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, Union
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
+from src.server.core.records import CSV_COLUMNS, ProductRecord, RecordBatch
+
+pd = lazy_import("pandas")
 
 logger = setup_logger(__name__)
 
@@ -9,24 +14,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 DATA_DIR = BASE_DIR / 'data' / 'processed'
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-def save_scraped_data_to_csv(data: List[Dict[str, Any]], filename: str) -> None:
+def save_scraped_data_to_csv(data: Union[RecordBatch, Iterable[ProductRecord]], filename: str) -> pd.DataFrame:
+    """
+    Writes a site's records to its CSV and returns them as a DataFrame,
+    so the caller can hand the same frame to the analyzer.
+    """
     file_path = DATA_DIR / filename
-    
-    # Standard Columns
-    cols = ['product_name', 'final_price', 'product_link']
+    batch = data if isinstance(data, RecordBatch) else RecordBatch(data)
 
-    if not data:
-        logger.warning(f"[DATA] No data for {filename}. Creating empty file.")
-        df = pd.DataFrame(columns=cols)
+    if not len(batch):
+        logger.warning("[DATA] No data for %s. Creating empty file.", filename)
+        df = pd.DataFrame(columns=CSV_COLUMNS)
     else:
-        df = pd.DataFrame(data)
-        for c in cols:
-            if c not in df.columns:
-                df[c] = ""
-        df = df[cols]
+        df = batch.to_dataframe()
 
     try:
         df.to_csv(file_path, index=False, encoding='utf-8-sig')
-        logger.info(f"[DATA] Saved {len(df)} records to {filename}")
+        logger.info("[DATA] Saved %s records to %s", len(df), filename)
     except Exception as e:
-        logger.error(f"[DATA] Failed to save {filename}: {e}")
\ No newline at end of file
+        logger.error("[DATA] Failed to save %s: %s", filename, e)
+    return df
@@ -3,20 +3,30 @@ Concurrency Engine Module.
 
 This module handles the parallel execution of scraper tasks using separate threads.
 It ensures that I/O bound tasks (like web scraping) run efficiently.
+In distributed mode the URLs are published to the server's work queue instead and
+scraped by standalone worker processes, which lease them through the work broker
+(see worker.py).
 """
 
 import threading
+import time
+import uuid
 from queue import Queue
-from typing import Callable, List, Dict, Any
+from pathlib import Path
+from typing import Callable, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 from src.common.logger import setup_logger
+from src.server.core.frontier import iter_urls
+from src.server.core.records import ProductRecord
+from src.server.core.work_queue import QUEUE_DB, WorkQueue
+from config.settings import WORKER_POLL_INTERVAL, DISTRIBUTED_JOB_TIMEOUT
 
 logger = setup_logger(__name__)
 
 def run_crawler_threads(
-    target_func: Callable[[Queue, List[Dict[str, Any]]], None], 
+    target_func: Callable[[Queue, List[ProductRecord]], None], 
     url_queue: Queue, 
-    result_list: List[Dict[str, Any]],
+    result_list: List[ProductRecord],
     worker_count: int = 2
 ) -> None:
     """
@@ -28,7 +38,7 @@ def run_crawler_threads(
         result_list (List): The shared list to store results.
         worker_count (int): Number of concurrent threads.
     """
-    logger.info(f"Starting crawler engine with {worker_count} workers for {target_func.__name__}...")
+    logger.info("Starting crawler engine with %s workers for %s...", worker_count, target_func.__name__)
     
     with ThreadPoolExecutor(max_workers=worker_count) as executor:
         futures = []
@@ -40,6 +50,53 @@ def run_crawler_threads(
             try:
                 future.result()
             except Exception as e:
-                logger.error(f"Thread execution failed: {e}")
+                logger.error("Thread execution failed: %s", e)
 
-    logger.info("All crawler threads finished execution.")
\ No newline at end of file
+    logger.info("All crawler threads finished execution.")
+
+def run_distributed_crawl(
+    site: str,
+    url_queue: Queue,
+    result_list: List[ProductRecord],
+    job_id: Optional[str] = None,
+    timeout: float = DISTRIBUTED_JOB_TIMEOUT,
+    queue_path: Path = QUEUE_DB,
+    poll_interval: float = WORKER_POLL_INTERVAL
+) -> None:
+    """
+    Publishes the queued URLs to the shared work queue and waits for workers.
+
+    The records posted back by the workers are appended to result_list, so the
+    caller sees the same result shape as with run_crawler_threads.
+
+    Args:
+        site (str): Scraper key the workers dispatch on ('digikala' / 'amazon').
+        url_queue (Queue): The queue containing URLs to scrape.
+        result_list (List): The shared list to store results.
+        job_id (str): Identifier grouping this crawl's tasks. Generated if omitted.
+        timeout (float): Seconds to wait for workers before giving up.
+        queue_path (Path): SQLite file of the work queue the workers poll.
+        poll_interval (float): Seconds between job status checks.
+    """
+    job_id = job_id or f"{site}-{uuid.uuid4().hex[:12]}"
+    work_queue = WorkQueue(queue_path)
+    try:
+        # Publish URLs as the search yields them so workers start before it ends
+        published = 0
+        for url in iter_urls(url_queue):
+            published += work_queue.publish(job_id, site, [url])
+        logger.info("Published %s %s tasks as job %s; waiting for workers...", published, site, job_id)
+
+        deadline = time.monotonic() + timeout
+        while not work_queue.is_finished(job_id):
+            if time.monotonic() > deadline:
+                logger.error("Job %s timed out: %s", job_id, work_queue.job_status(job_id))
+                cancelled = work_queue.cancel(job_id)
+                logger.warning("Cancelled %s unfinished tasks of job %s.", cancelled, job_id)
+                break
+            time.sleep(poll_interval)
+
+        result_list.extend(ProductRecord.from_dict(d) for d in work_queue.results(job_id))
+        logger.info("Job %s finished: %s", job_id, work_queue.job_status(job_id))
+    finally:
+        work_queue.close()
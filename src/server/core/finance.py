@@ -3,9 +3,13 @@ Finance Module.
 Handles dynamic currency conversion and import cost calculations.
 """
 
-import requests
 import re
+import time
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
+from config.settings import FX_RATE_TTL
+
+requests = lazy_import("requests")
 
 logger = setup_logger(__name__)
 
@@ -14,11 +18,18 @@ FALLBACK_USD_IRR = 60_000
 CUSTOMS_DUTY_PERCENT = 0.30  # 30% Customs Tax
 SHIPPING_COST_USD = 25       # Approx $25 shipping per item
 
+# Last live rate and when it was fetched; reused for FX_RATE_TTL seconds
+_rate_cache = {"rate": None, "fetched_at": 0.0}
+
 def get_current_usd_rate() -> float:
     """
     Fetches the current USD to IRR rate.
     Tries multiple sources, falls back to constant if all fail.
+    A live rate is cached for FX_RATE_TTL seconds; the fallback is never cached.
     """
+    if _rate_cache["rate"] is not None and time.monotonic() - _rate_cache["fetched_at"] < FX_RATE_TTL:
+        return _rate_cache["rate"]
+
     # Source 1: Bonbast API (Unofficial/Scraping mirror) or similar lightweight JSON
     # Since stable free APIs for free-market IRR are rare, we use a reliable scraping logic 
     # or a known public API if available. For this project, we'll simulate a request 
@@ -31,12 +42,13 @@ def get_current_usd_rate() -> float:
         if response.status_code == 200:
             data = response.json()
             usdt_price = float(data['data']['currencies']['USDT']['price'])
-            logger.info(f"[FINANCE] Fetched real-time USD(T) rate: {usdt_price:,.0f} IRR")
+            logger.info("[FINANCE] Fetched real-time USD(T) rate: %s IRR", f"{usdt_price:,.0f}")
+            _rate_cache.update(rate=usdt_price, fetched_at=time.monotonic())
             return usdt_price
     except Exception as e:
-        logger.warning(f"[FINANCE] Source 1 failed: {e}")
+        logger.warning("[FINANCE] Source 1 failed: %s", e)
 
-    logger.warning(f"[FINANCE] Using fallback rate: {FALLBACK_USD_IRR:,.0f} IRR")
+    logger.warning("[FINANCE] Using fallback rate: %s IRR", f"{FALLBACK_USD_IRR:,.0f}")
     return float(FALLBACK_USD_IRR)
 
 def calculate_landed_cost(price_usd: float, exchange_rate: float) -> float:
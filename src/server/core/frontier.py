@@ -0,0 +1,106 @@
+"""
+URL Frontier Module.
+
+Canonicalizes product URLs (Amazon ASIN, Digikala dkp id), drops duplicates
+across result pages and sites, and streams new URLs into a crawl queue while
+the search is still paging, so scraping starts before the search finishes.
+"""
+
+import re
+import threading
+from queue import Queue, Empty
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from config.settings import MAX_SEARCH_RESULTS
+
+_ASIN_RE = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})(?:[/?#]|$)')
+_DKP_RE = re.compile(r'/product/dkp-(\d+)')
+
+
+def canonicalize_product_url(site: str, url: str) -> Optional[Tuple[str, str]]:
+    """
+    Reduces a product link to its stable identity.
+
+    Returns:
+        Tuple[str, str]: (canonical id, canonical URL), or None if the link
+        is not a product page of the given site.
+    """
+    if not url:
+        return None
+    if site == "amazon":
+        match = _ASIN_RE.search(url)
+        if match:
+            asin = match.group(1)
+            return asin, f"https://www.amazon.com/dp/{asin}"
+    elif site == "digikala":
+        match = _DKP_RE.search(url)
+        if match:
+            dkp = f"dkp-{match.group(1)}"
+            return dkp, f"https://www.digikala.com/product/{dkp}/"
+    return None
+
+
+class CrawlQueue(Queue):
+    """
+    URL queue that a search producer fills while scrapers consume it.
+    Consumers keep waiting on an empty queue until the producer calls close().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.closed = threading.Event()
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def iter_urls(queue: Queue, poll_interval: float = 0.5) -> Iterator[str]:
+    """
+    Yields URLs until the queue is drained and its producer is done.
+
+    A plain Queue counts as already closed, i.e. iteration stops once it is
+    empty. Unlike `while not queue.empty(): queue.get()`, this never blocks
+    forever when several threads race for the last item.
+    """
+    closed = getattr(queue, 'closed', None)
+    while True:
+        try:
+            yield queue.get(timeout=poll_interval) if closed is not None else queue.get_nowait()
+        except Empty:
+            if closed is None or (closed.is_set() and queue.empty()):
+                return
+
+
+class UrlFrontier:
+    """
+    Deduplicating gate between search results and crawl queues.
+
+    Seen products are kept as compact 'site:id' keys, so the same product found
+    on several result pages (or under several URL variants) is queued once.
+    """
+
+    def __init__(self, max_per_site: int = MAX_SEARCH_RESULTS):
+        self.max_per_site = max_per_site
+        self._seen: Set[str] = set()
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def offer(self, site: str, url: str, queue: Queue) -> Optional[str]:
+        """Queues the canonical URL if it is a new product. Returns it if queued."""
+        canonical = canonicalize_product_url(site, url)
+        if canonical is None:
+            return None
+        key = f"{site}:{canonical[0]}"
+        with self._lock:
+            if key in self._seen or self.is_full(site):
+                return None
+            self._seen.add(key)
+            self._counts[site] = self._counts.get(site, 0) + 1
+        queue.put(canonical[1])
+        return canonical[1]
+
+    def is_full(self, site: str) -> bool:
+        return self._counts.get(site, 0) >= self.max_per_site
+
+    def count(self, site: str) -> int:
+        return self._counts.get(site, 0)
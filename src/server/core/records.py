@@ -0,0 +1,227 @@
+"""
+Product Records Module.
+
+Typed result records for the scrapers and a columnar batch that collects them.
+
+ProductRecord is a slotted dataclass (no per-instance __dict__). RecordBatch
+stores the same fields column by column: numbers in typed `array` buffers,
+low-cardinality strings (site, currency) as int8 codes, and converts to a
+DataFrame by wrapping those buffers instead of copying them.
+
+Memory benchmark:
+    python -m src.server.core.records [n_records]
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from array import array
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.common.lazy import lazy_import
+from src.server.core.frontier import canonicalize_product_url
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+# Column order of the per-site CSVs (the first three are the original schema)
+CSV_COLUMNS = ['product_name', 'final_price', 'product_link',
+               'site', 'canonical_id', 'currency', 'scraped_at', 'cached']
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """One scraped product offer."""
+    site: str
+    canonical_id: str
+    title: str
+    price: float
+    currency: str
+    url: str
+    timestamp: float = field(default_factory=time.time)
+    cached: bool = False  # True if parsed from the raw page archive, not a live fetch
+
+    @classmethod
+    def from_page(cls, site: str, url: str, title: str, price: float, currency: str) -> "ProductRecord":
+        """Builds a record, deriving the canonical id (ASIN / dkp id) from the URL."""
+        canonical = canonicalize_product_url(site, url)
+        return cls(site, canonical[0] if canonical else url, title, float(price), currency, url)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductRecord":
+        return cls(**data)
+
+    def as_row(self) -> Dict[str, Any]:
+        """The record keyed by CSV column names."""
+        return {
+            'product_name': self.title,
+            'final_price': self.price,
+            'product_link': self.url,
+            'site': self.site,
+            'canonical_id': self.canonical_id,
+            'currency': self.currency,
+            'scraped_at': self.timestamp,
+            'cached': self.cached,
+        }
+
+
+class _CodeColumn:
+    """Dictionary-encoded string column (int8 codes + category list)."""
+
+    __slots__ = ('codes', 'categories', '_index')
+
+    def __init__(self):
+        self.codes = array('b')
+        self.categories: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+
+class RecordBatch:
+    """
+    Thread-safe, append-only columnar collection of ProductRecords.
+
+    Has the list methods the scrapers use on their shared result list
+    (append / extend / len / iteration), so it can be passed in its place.
+    Once converted with to_dataframe() the DataFrame shares the numeric
+    buffers, so the batch is frozen against further appends.
+    """
+
+    def __init__(self, records: Optional[Iterable[ProductRecord]] = None):
+        self._sites = _CodeColumn()
+        self._currencies = _CodeColumn()
+        self._canonical_ids: List[str] = []
+        self._titles: List[str] = []
+        self._urls: List[str] = []
+        self._prices = array('d')
+        self._timestamps = array('d')
+        self._cached = array('b')
+        self._lock = threading.Lock()
+        self._frozen = False
+        if records:
+            self.extend(records)
+
+    def _append_unlocked(self, record: ProductRecord) -> None:
+        self._sites.append(record.site)
+        self._currencies.append(record.currency)
+        self._canonical_ids.append(record.canonical_id)
+        self._titles.append(record.title)
+        self._urls.append(record.url)
+        self._prices.append(record.price)
+        self._timestamps.append(record.timestamp)
+        self._cached.append(record.cached)
+
+    def append(self, record: ProductRecord) -> None:
+        with self._lock:
+            if self._frozen:
+                raise RuntimeError("RecordBatch was converted to a DataFrame and is read-only.")
+            self._append_unlocked(record)
+
+    def extend(self, records: Iterable[ProductRecord]) -> None:
+        with self._lock:
+            if self._frozen:
+                raise RuntimeError("RecordBatch was converted to a DataFrame and is read-only.")
+            for record in records:
+                self._append_unlocked(record)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __iter__(self) -> Iterator[ProductRecord]:
+        sites, currencies = self._sites.categories, self._currencies.categories
+        for i in range(len(self)):
+            yield ProductRecord(
+                sites[self._sites.codes[i]], self._canonical_ids[i], self._titles[i],
+                self._prices[i], currencies[self._currencies.codes[i]], self._urls[i],
+                self._timestamps[i], bool(self._cached[i])
+            )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the batch as a DataFrame with CSV_COLUMNS.
+
+        Numeric columns are zero-copy views of the batch's buffers and the
+        site/currency columns are categoricals built from the int8 codes.
+        """
+        with self._lock:
+            self._frozen = True
+        columns = {
+            'product_name': np.array(self._titles, dtype=object),
+            'final_price': np.frombuffer(self._prices, dtype=np.float64),
+            'product_link': np.array(self._urls, dtype=object),
+            'site': pd.Categorical.from_codes(np.frombuffer(self._sites.codes, dtype=np.int8),
+                                              categories=self._sites.categories),
+            'canonical_id': np.array(self._canonical_ids, dtype=object),
+            'currency': pd.Categorical.from_codes(np.frombuffer(self._currencies.codes, dtype=np.int8),
+                                                  categories=self._currencies.categories),
+            'scraped_at': np.frombuffer(self._timestamps, dtype=np.float64),
+            'cached': np.frombuffer(self._cached, dtype=np.int8).view(np.bool_),
+        }
+        return pd.DataFrame(columns, columns=CSV_COLUMNS, copy=False)
+
+
+def _synthetic_records(n: int) -> Iterator[ProductRecord]:
+    now = time.time()
+    for i in range(n):
+        asin = f"B{i:09d}"
+        yield ProductRecord("amazon", asin, f"Apple iPhone 13 Pro Max 256GB #{i}", 999.0 + i % 500,
+                            "USD", f"https://www.amazon.com/dp/{asin}", now + i)
+
+
+def _bench_memory(n: int) -> tuple:
+    import tracemalloc
+
+    def measure(build):
+        tracemalloc.start()
+        obj = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return obj, current
+
+    dicts, dict_bytes = measure(lambda: [
+        {"product_name": r.title, "final_price": r.price, "product_link": r.url}
+        for r in _synthetic_records(n)
+    ])
+    records, record_bytes = measure(lambda: list(_synthetic_records(n)))
+    batch, batch_bytes = measure(lambda: RecordBatch(_synthetic_records(n)))
+
+    print(f"{n:,} records (strings included)")
+    print(f"  list of dicts (3 fields)    : {dict_bytes / 1e6:7.1f} MB")
+    print(f"  list of ProductRecord (8)   : {record_bytes / 1e6:7.1f} MB")
+    print(f"  RecordBatch (8, columnar)   : {batch_bytes / 1e6:7.1f} MB")
+    return dicts, batch
+
+
+def _bench_dataframe(dicts: List[Dict[str, Any]], batch: RecordBatch) -> None:
+    started = time.perf_counter()
+    df = pd.DataFrame(dicts)
+    for c in ['product_name', 'final_price', 'product_link']:
+        if c not in df.columns:
+            df[c] = ""
+    dict_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_df = batch.to_dataframe()
+    batch_time = time.perf_counter() - started
+
+    shares = np.shares_memory(batch_df['final_price'].to_numpy(), np.frombuffer(batch._prices))
+    print(f"  DataFrame from dicts        : {dict_time * 1000:7.1f} ms")
+    print(f"  DataFrame from RecordBatch  : {batch_time * 1000:7.1f} ms  (price buffer shared: {shares})")
+
+
+if __name__ == "__main__":
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    _dicts, _batch = _bench_memory(n_records)
+    _bench_dataframe(_dicts, _batch)
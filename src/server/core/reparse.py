@@ -0,0 +1,116 @@
+"""
+Offline Re-Parse Module.
+
+Runs the current product extractors over the raw page archive, in parallel
+across CPU cores, without any network access. Records are streamed to the
+per-site CSVs so the archive never has to fit in memory.
+
+Usage:
+    python -m src.server.core.reparse [digikala|amazon]
+"""
+
+import csv
+import importlib
+import sys
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from src.common.logger import enable_file_logging, setup_logger
+from src.server.core.archive import ArchivedPage, PageArchive, ARCHIVE_DIR, read_page
+from src.server.core.data_manager import DATA_DIR
+from src.server.core.records import CSV_COLUMNS, ProductRecord
+from config.settings import REPARSE_WORKERS
+
+logger = setup_logger(__name__)
+
+# site -> (module, parser function); resolved lazily inside worker processes
+PARSERS = {
+    "digikala": ("src.server.core.scrapers.digikala", "parse_digikala_product"),
+    "amazon": ("src.server.core.scrapers.amazon", "parse_amazon_product"),
+}
+
+_BATCH_SIZE = 256
+
+
+def _parse_entry(task: Tuple[str, ArchivedPage]) -> Optional[ProductRecord]:
+    root, entry = task
+    module_name, func_name = PARSERS[entry.site]
+    parser = getattr(importlib.import_module(module_name), func_name)
+    try:
+        record = parser(read_page(Path(root), entry), entry.url)
+    except Exception as e:
+        logger.error("[REPARSE] Failed on %s: %s", entry.url, e)
+        return None
+    if record:
+        # Stamp with the original fetch time and flag it as served from the archive
+        record.timestamp = entry.fetched_at
+        record.cached = True
+    return record
+
+
+def reparse_archive(site: Optional[str] = None, workers: Optional[int] = REPARSE_WORKERS,
+                    archive: Optional[PageArchive] = None) -> Iterator[ProductRecord]:
+    """
+    Streams the records extracted from the latest archived copy of every URL.
+
+    Index entries are fed to the process pool in fixed-size batches, so memory
+    stays bounded by the batch size rather than the archive size.
+    """
+    archive = archive or PageArchive(ARCHIVE_DIR)
+    root = str(archive.root)
+    entries = (e for e in archive.iter_entries(site=site) if e.site in PARSERS)
+
+    with Pool(processes=workers) as pool:
+        while True:
+            batch = [(root, e) for e in islice(entries, _BATCH_SIZE)]
+            if not batch:
+                break
+            for record in pool.imap(_parse_entry, batch, chunksize=8):
+                if record:
+                    yield record
+
+
+def rebuild_csvs_from_archive(site: Optional[str] = None) -> Dict[str, int]:
+    """
+    Rewrites digikala.csv / amazon.csv from the archive.
+
+    Returns:
+        Dict[str, int]: Number of records written per site.
+    """
+    sites = [site] if site else list(PARSERS)
+    files = {s: open(DATA_DIR / f"{s}.csv", 'w', newline='', encoding='utf-8-sig') for s in sites}
+    writers = {s: csv.DictWriter(f, fieldnames=CSV_COLUMNS) for s, f in files.items()}
+    counts = {s: 0 for s in sites}
+
+    try:
+        for w in writers.values():
+            w.writeheader()
+        for record in reparse_archive(site):
+            writers[record.site].writerow(record.as_row())
+            counts[record.site] += 1
+    finally:
+        for f in files.values():
+            f.close()
+
+    for s, n in counts.items():
+        logger.info("[REPARSE] Rebuilt %s.csv with %s records from archive.", s, n)
+    return counts
+
+
+def start_reparse_app(site: Optional[str] = None) -> None:
+    """Rebuilds the per-site CSVs and the comparison report from archived pages."""
+    from src.server.core.analytics import analyze_purchase_options
+
+    enable_file_logging("reparse")
+    rebuild_csvs_from_archive(site)
+    report_path = analyze_purchase_options()
+    if report_path:
+        logger.info("[REPARSE] Report rebuilt: %s", report_path)
+    else:
+        logger.warning("[REPARSE] No data to analyze.")
+
+
+if __name__ == "__main__":
+    start_reparse_app(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,160 @@
+"""
+Report Index Module.
+
+Keeps the ranked comparison report of recent jobs in memory and answers
+slice queries (top-N, price range, source, text, pagination) over it, so
+clients fetch only the rows they display instead of the whole CSV.
+
+Rows are stored once, sorted by final price. Price ranges resolve with a
+binary search over the sorted prices; the per-source and per-word indexes
+hold row positions in the same order, so every filter result is already
+ranked and pagination is a plain slice.
+"""
+
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from config.settings import REPORT_CACHE_SIZE
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(str(text).lower())
+
+
+class RankedReport:
+    """Immutable, price-ordered report of one job with query indexes."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = sorted(rows, key=lambda r: float(r.get('final_price') or 0))
+        self.prices = [float(r.get('final_price') or 0) for r in self.rows]
+        self.by_source: Dict[str, List[int]] = {}
+        self.by_word: Dict[str, List[int]] = {}
+        for pos, row in enumerate(self.rows):
+            self.by_source.setdefault(str(row.get('source', '')).lower(), []).append(pos)
+            for word in set(_words(row.get('product_name', ''))):
+                self.by_word.setdefault(word, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _positions(self, source: Optional[str], min_price: Optional[float],
+                   max_price: Optional[float], text: Optional[str]) -> List[int]:
+        lo = bisect_left(self.prices, float(min_price)) if min_price is not None else 0
+        hi = bisect_right(self.prices, float(max_price)) if max_price is not None else len(self.prices)
+
+        candidates: Optional[List[int]] = None
+        if source:
+            # Match on a substring of the label, e.g. 'amazon' -> 'amazon (imported)'
+            needle = str(source).lower()
+            merged: Set[int] = set()
+            for label, positions in self.by_source.items():
+                if needle in label:
+                    merged.update(positions)
+            candidates = sorted(merged)
+
+        if text:
+            for word in _words(text):
+                positions = self.by_word.get(word, [])
+                candidates = positions if candidates is None else sorted(set(candidates).intersection(positions))
+
+        if candidates is None:
+            return list(range(lo, hi))
+        # Positions are in price order, so the price range is a sub-slice
+        return candidates[bisect_left(candidates, lo):bisect_left(candidates, hi)]
+
+    def query(self, source: Optional[str] = None, min_price: Optional[float] = None,
+              max_price: Optional[float] = None, text: Optional[str] = None,
+              offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns the matching rows, cheapest first.
+
+        Args:
+            source (str): Case-insensitive part of the source label ('amazon').
+            min_price / max_price (float): Inclusive final price bounds (IRR).
+            text (str): Words that must all appear in the product name.
+            offset / limit (int): Slice of the matches to return.
+
+        Returns:
+            Dict: {'total': number of matches, 'offset': offset, 'rows': [...]}
+        """
+        positions = self._positions(source, min_price, max_price, text)
+        offset = max(int(offset), 0)
+        end = len(positions) if limit is None else offset + max(int(limit), 0)
+        return {
+            'total': len(positions),
+            'offset': offset,
+            'rows': [self.rows[p] for p in positions[offset:end]],
+        }
+
+    def top(self, n: int = 5, **filters) -> Dict[str, Any]:
+        return self.query(limit=n, **filters)
+
+    def page(self, page: int = 1, page_size: int = 20, **filters) -> Dict[str, Any]:
+        return self.query(offset=(max(int(page), 1) - 1) * int(page_size), limit=page_size, **filters)
+
+
+class ReportStore:
+    """Thread-safe LRU map of job id -> RankedReport."""
+
+    def __init__(self, capacity: int = REPORT_CACHE_SIZE):
+        self.capacity = capacity
+        self._reports: "OrderedDict[str, RankedReport]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, job_id: str, rows: List[Dict[str, Any]]) -> RankedReport:
+        report = RankedReport(rows)
+        with self._lock:
+            self._reports[job_id] = report
+            self._reports.move_to_end(job_id)
+            while len(self._reports) > self.capacity:
+                self._reports.popitem(last=False)
+        return report
+
+    def get(self, job_id: str) -> Optional[RankedReport]:
+        with self._lock:
+            report = self._reports.get(job_id)
+            if report is not None:
+                self._reports.move_to_end(job_id)
+            return report
+
+
+_FILTER_KEYS = ('source', 'min_price', 'max_price', 'text')
+
+
+def run_report_query(store: ReportStore, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Executes a client query request against the store.
+
+    Request shape:
+        {"action": "query", "job_id": "...", "op": "top" | "page" | "filter",
+         "n": 5, "page": 1, "page_size": 20, "offset": 0, "limit": 20,
+         "source": "...", "min_price": 0, "max_price": 0, "text": "..."}
+    """
+    job_id = request.get('job_id')
+    if not isinstance(job_id, str):
+        return {'error': f"Bad query: job_id must be a string, got {type(job_id).__name__}"}
+    report = store.get(job_id) if job_id else None
+    if report is None:
+        return {'error': f"Unknown or expired job: {job_id}"}
+
+    filters = {k: request[k] for k in _FILTER_KEYS if request.get(k) not in (None, '')}
+    op = request.get('op', 'filter')
+    try:
+        if op == 'top':
+            result = report.top(int(request.get('n', 5)), **filters)
+        elif op == 'page':
+            result = report.page(int(request.get('page', 1)), int(request.get('page_size', 20)), **filters)
+        elif op == 'filter':
+            result = report.query(offset=request.get('offset', 0), limit=request.get('limit'), **filters)
+        else:
+            return {'error': f"Unknown op: {op}"}
+    except (TypeError, ValueError, AttributeError) as e:
+        return {'error': f"Bad query: {e}"}
+
+    result['job_id'] = job_id
+    return result
@@ -1,12 +1,19 @@
 import time
 import random
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
 from queue import Queue
-from typing import List, Dict, Any
+from typing import List, Optional
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
+from src.server.core.archive import archive_page
+from src.server.core.browser import acquire_driver, release_driver
+from src.server.core.frontier import iter_urls
+from src.server.core.records import ProductRecord
+from config.settings import ARCHIVE_RAW_PAGES
+
+webdriver = lazy_import("selenium.webdriver")
+Options = lazy_import("selenium.webdriver.chrome.options", "Options")
+By = lazy_import("selenium.webdriver.common.by", "By")
+BeautifulSoup = lazy_import("bs4", "BeautifulSoup")
 
 logger = setup_logger(__name__)
 
@@ -32,7 +39,41 @@ def handle_product_page_error(driver):
     except: pass
     return True
 
-def scrape_amazon_product_details(queue: Queue, result_list: List[Dict[str, Any]]) -> None:
+def parse_amazon_product(html: str, url: str) -> Optional[ProductRecord]:
+    """
+    Extracts title and USD price from an Amazon product page.
+    Pure function of the HTML, so it also runs over archived pages.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    title_tag = soup.find("span", {"id": "productTitle"})
+    title = title_tag.get_text().strip() if title_tag else "Unknown Amazon Product"
+    
+    price_usd = 0.0
+    
+    # Price Logic
+    price_elements = soup.select(".a-price .a-offscreen")
+    for p in price_elements:
+        text = p.get_text().strip().replace("$", "").replace(",", "")
+        try:
+            val = float(text)
+            if val > 5: 
+                price_usd = val
+                break 
+        except: continue
+    
+    if price_usd == 0:
+        apex = soup.select_one("span.apexPriceToPay span.a-offscreen")
+        if apex:
+            try: price_usd = float(apex.get_text().replace("$", "").replace(",", ""))
+            except: pass
+
+    if price_usd > 0:
+        return ProductRecord.from_page("amazon", url, title, price_usd, "USD")
+    logger.warning("[AMAZON] Price missing: %s...", title[:15])
+    return None
+
+def create_amazon_driver():
     options = Options()
     # options.add_argument('--headless') 
     options.add_argument('--disable-gpu')
@@ -43,10 +84,17 @@ def scrape_amazon_product_details(queue: Queue, result_list: List[Dict[str, Any]
     options.add_experimental_option('useAutomationExtension', False)
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
-    while not queue.empty():
-        url = queue.get()
-        driver = webdriver.Chrome(options=options)
+    return webdriver.Chrome(options=options)
+
+def scrape_amazon_product_details(queue: Queue, result_list: List[ProductRecord],
+                                  failures: Optional[List[str]] = None) -> None:
+    """
+    Scrapes every product URL from the queue into result_list.
+    URLs that raised or yielded no record are appended to `failures`, if given.
+    """
+    for url in iter_urls(queue):
+        driver = acquire_driver("amazon", create_amazon_driver)
+        healthy = True
         try:
             driver.get(url)
             time.sleep(random.uniform(2.0, 4.0))
@@ -63,41 +111,21 @@ def scrape_amazon_product_details(queue: Queue, result_list: List[Dict[str, Any]
                         time.sleep(2)
             except: pass
             
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            title_tag = soup.find("span", {"id": "productTitle"})
-            title = title_tag.get_text().strip() if title_tag else "Unknown Amazon Product"
-            
-            price_usd = 0.0
-            
-            # Price Logic
-            price_elements = soup.select(".a-price .a-offscreen")
-            for p in price_elements:
-                text = p.get_text().strip().replace("$", "").replace(",", "")
-                try:
-                    val = float(text)
-                    if val > 5: 
-                        price_usd = val
-                        break 
-                except: continue
-            
-            if price_usd == 0:
-                apex = soup.select_one("span.apexPriceToPay span.a-offscreen")
-                if apex:
-                    try: price_usd = float(apex.get_text().replace("$", "").replace(",", ""))
-                    except: pass
+            html = driver.page_source
+            if ARCHIVE_RAW_PAGES:
+                archive_page("amazon", url, html)
 
-            if price_usd > 0:
-                result_list.append({
-                    "product_name": title,
-                    "final_price": price_usd,
-                    "product_link": url
-                })
-                logger.info(f"[AMAZON] Scraped: {title[:15]}... - ${price_usd}")
-            else:
-                logger.warning(f"[AMAZON] Price missing: {title[:15]}...")
+            record = parse_amazon_product(html, url)
+            if record:
+                result_list.append(record)
+                logger.info("[AMAZON] Scraped: %s... - $%s", record.title[:15], record.price)
+            elif failures is not None:
+                failures.append(url)
                 
         except Exception as e:
-            logger.error(f"[AMAZON] Scrape Error: {e}")
+            healthy = False
+            logger.error("[AMAZON] Scrape Error: %s", e)
+            if failures is not None:
+                failures.append(url)
         finally:
-            driver.quit()
\ No newline at end of file
+            release_driver("amazon", driver, healthy)
\ No newline at end of file
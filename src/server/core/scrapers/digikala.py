@@ -1,73 +1,101 @@
 import json
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 from queue import Queue
-from typing import List, Dict, Any
+from typing import List, Optional
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
+from src.server.core.archive import archive_page
+from src.server.core.browser import acquire_driver, release_driver
+from src.server.core.frontier import iter_urls
+from src.server.core.records import ProductRecord
+from config.settings import ARCHIVE_RAW_PAGES
+
+webdriver = lazy_import("selenium.webdriver")
+Options = lazy_import("selenium.webdriver.chrome.options", "Options")
+BeautifulSoup = lazy_import("bs4", "BeautifulSoup")
 
 logger = setup_logger(__name__)
 
-def scrape_digikala_product_details(queue: Queue, result_list: List[Dict[str, Any]]) -> None:
+def parse_digikala_product(html: str, url: str) -> Optional[ProductRecord]:
+    """
+    Extracts title and IRR price from a Digikala product page.
+    Pure function of the HTML, so it also runs over archived pages.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    title_tag = soup.find("h1")
+    title = title_tag.get_text().strip() if title_tag else "Unknown Digikala Product"
+    
+    price_irr = 0.0
+    
+    # JSON-LD Strategy
+    scripts = soup.find_all('script', type='application/ld+json')
+    for script in scripts:
+        try:
+            data = json.loads(script.string)
+            if isinstance(data, list):
+                for item in data:
+                    if item.get('@type') == 'Product':
+                        data = item
+                        break
+            if data.get('@type') == 'Product':
+                offers = data.get('offers', {})
+                if isinstance(offers, list): offers = offers[0]
+                price_val = offers.get('price')
+                if price_val:
+                    if offers.get('priceCurrency') == 'IRR':
+                        price_irr = float(price_val)
+                    else:
+                        price_irr = float(price_val) * 10
+                    break
+        except: continue
+
+    if price_irr == 0:
+        meta_price = soup.find("meta", property="product:price:amount")
+        if meta_price and meta_price.get("content"):
+            try: price_irr = float(meta_price["content"])
+            except: pass
+
+    if price_irr > 100_000:
+        return ProductRecord.from_page("digikala", url, title, price_irr, "IRR")
+    return None
+
+def create_digikala_driver():
     options = Options()
     # options.add_argument('--headless') 
     options.add_argument('--disable-gpu')
     options.add_argument("--log-level=3")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
-    
-    while not queue.empty():
-        url = queue.get()
-        driver = webdriver.Chrome(options=options)
+    return webdriver.Chrome(options=options)
+
+def scrape_digikala_product_details(queue: Queue, result_list: List[ProductRecord],
+                                    failures: Optional[List[str]] = None) -> None:
+    """
+    Scrapes every product URL from the queue into result_list.
+    URLs that raised or yielded no record are appended to `failures`, if given.
+    """
+    for url in iter_urls(queue):
+        driver = acquire_driver("digikala", create_digikala_driver)
+        healthy = True
         try:
             driver.get(url)
             time.sleep(3)
             
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            title_tag = soup.find("h1")
-            title = title_tag.get_text().strip() if title_tag else "Unknown Digikala Product"
-            
-            price_irr = 0.0
-            
-            # JSON-LD Strategy
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                data = item
-                                break
-                    if data.get('@type') == 'Product':
-                        offers = data.get('offers', {})
-                        if isinstance(offers, list): offers = offers[0]
-                        price_val = offers.get('price')
-                        if price_val:
-                            if offers.get('priceCurrency') == 'IRR':
-                                price_irr = float(price_val)
-                            else:
-                                price_irr = float(price_val) * 10
-                            break
-                except: continue
-
-            if price_irr == 0:
-                meta_price = soup.find("meta", property="product:price:amount")
-                if meta_price and meta_price.get("content"):
-                    try: price_irr = float(meta_price["content"])
-                    except: pass
+            html = driver.page_source
+            if ARCHIVE_RAW_PAGES:
+                archive_page("digikala", url, html)
 
-            if price_irr > 100_000:
-                # FIXED KEYS
-                result_list.append({
-                    "product_name": title,
-                    "final_price": price_irr,
-                    "product_link": url
-                })
-                logger.info(f"[DIGIKALA] Scraped: {title[:15]}... - {price_irr:,.0f} IRR")
+            record = parse_digikala_product(html, url)
+            if record:
+                result_list.append(record)
+                logger.info("[DIGIKALA] Scraped: %s... - %.0f IRR", record.title[:15], record.price)
+            elif failures is not None:
+                failures.append(url)
             
         except Exception as e:
-            logger.error(f"[DIGIKALA] Scrape Error: {e}")
+            healthy = False
+            logger.error("[DIGIKALA] Scrape Error: %s", e)
+            if failures is not None:
+                failures.append(url)
         finally:
-            driver.quit()
\ No newline at end of file
+            release_driver("digikala", driver, healthy)
\ No newline at end of file
@@ -1,22 +1,31 @@
 import time
 import random
+import threading
 from queue import Queue
-from typing import List, Set
+from typing import List, Optional
 from urllib.parse import quote_plus 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
+from src.server.core.browser import acquire_driver, release_driver
 from src.server.core.utils import translate_to_english
-from config.settings import SEARCH_PATTERNS, MAX_SEARCH_RESULTS
+from src.server.core.frontier import CrawlQueue, UrlFrontier
+from config.settings import SEARCH_PATTERNS, SEARCH_PAGE_DEPTH
+
+webdriver = lazy_import("selenium.webdriver")
+Options = lazy_import("selenium.webdriver.chrome.options", "Options")
+By = lazy_import("selenium.webdriver.common.by", "By")
+WebDriverWait = lazy_import("selenium.webdriver.support.ui", "WebDriverWait")
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
 
 logger = setup_logger(__name__)
 
-def _setup_driver():
+# Product links inside result cards only (no nav, ads or review links)
+DIGIKALA_RESULT_SELECTOR = "a[href*='/product/dkp-']"
+AMAZON_RESULT_SELECTOR = ("div[data-component-type='s-search-result'] a[href*='/dp/'], "
+                          "div[data-component-type='s-search-result'] a[href*='/gp/product/']")
+
+def create_search_driver():
     options = Options()
     # options.add_argument('--headless') # Headless OFF recommended for Amazon
     options.add_argument('--disable-gpu')
@@ -63,39 +72,66 @@ def _handle_potential_captcha(driver):
             time.sleep(5)
     except: pass
 
-def search_digikala(query: str) -> List[str]:
-    # (Standard robust Digikala logic)
-    search_url = SEARCH_PATTERNS['digikala'].format(query)
-    logger.info(f"[SEARCH] Digikala: '{query}'")
-    driver = _setup_driver()
-    links: Set[str] = set()
+def _page_url(site: str, query: str, page: int) -> str:
+    return SEARCH_PATTERNS[site].format(quote_plus(query)) + f"&page={page}"
+
+def _offer_links(driver, selector: str, site: str, frontier: UrlFrontier, queue: Queue, links: List[str]) -> int:
+    """Feeds product links matched by a targeted CSS selector into the frontier."""
+    added = 0
+    for elem in driver.find_elements(By.CSS_SELECTOR, selector):
+        if frontier.is_full(site): break
+        try:
+            link = frontier.offer(site, elem.get_attribute('href'), queue)
+            if link:
+                links.append(link)
+                added += 1
+        except: continue
+    return added
+
+def search_digikala(query: str, frontier: Optional[UrlFrontier] = None, queue: Optional[Queue] = None,
+                    depth: int = SEARCH_PAGE_DEPTH) -> List[str]:
+    """
+    Walks up to `depth` Digikala result pages, pushing new product links into
+    `queue` as soon as each page is read.
+    """
+    frontier = frontier or UrlFrontier()
+    queue = queue if queue is not None else Queue()
+    links: List[str] = []
+    logger.info("[SEARCH] Digikala: '%s' (up to %s pages)", query, depth)
+    driver = acquire_driver("search", create_search_driver)
+    healthy = True
     try:
-        driver.get(search_url)
-        time.sleep(2)
-        for _ in range(3):
-            driver.execute_script(f"window.scrollBy(0, {random.randint(800, 1500)});")
-            time.sleep(1)
-        elements = driver.find_elements(By.XPATH, "//a[contains(@href, '/product/dkp-')]")
-        for elem in elements:
-            try:
-                href = elem.get_attribute('href')
-                if href:
-                    links.add(href.split('?')[0])
-                    if len(links) >= MAX_SEARCH_RESULTS: break
-            except: continue
+        for page in range(1, depth + 1):
+            driver.get(_page_url('digikala', query, page))
+            time.sleep(2)
+            for _ in range(3):
+                driver.execute_script(f"window.scrollBy(0, {random.randint(800, 1500)});")
+                time.sleep(1)
+            added = _offer_links(driver, DIGIKALA_RESULT_SELECTOR, 'digikala', frontier, queue, links)
+            logger.info("[DIGIKALA] Page %s: %s new links.", page, added)
+            if added == 0 or frontier.is_full('digikala'): break
     except Exception as e:
-        logger.error(f"[DIGIKALA] Error: {e}")
+        healthy = False
+        logger.error("[DIGIKALA] Error: %s", e)
     finally:
-        driver.quit()
-    logger.info(f"[DIGIKALA] Found {len(links)} links.")
-    return list(links)
+        release_driver("search", driver, healthy)
+    logger.info("[DIGIKALA] Found %s links.", len(links))
+    return links
 
-def search_amazon(query: str) -> List[str]:
+def search_amazon(query: str, frontier: Optional[UrlFrontier] = None, queue: Optional[Queue] = None,
+                  depth: int = SEARCH_PAGE_DEPTH) -> List[str]:
+    """
+    Searches Amazon through the home page search box, then walks up to `depth`
+    result pages, pushing new product links into `queue` as each page is read.
+    """
     english_query = translate_to_english(query)
-    logger.info(f"[SEARCH] Amazon Agent: '{english_query}'")
+    logger.info("[SEARCH] Amazon Agent: '%s' (up to %s pages)", english_query, depth)
     
-    driver = _setup_driver()
-    links: Set[str] = set()
+    frontier = frontier or UrlFrontier()
+    queue = queue if queue is not None else Queue()
+    links: List[str] = []
+    driver = acquire_driver("search", create_search_driver)
+    healthy = True
     
     try:
         # 1. Start at Home Page (Safest entry point)
@@ -123,56 +159,58 @@ def search_amazon(query: str) -> List[str]:
             time.sleep(random.uniform(3.0, 5.0))
             
         except Exception as e:
-            logger.error(f"[AMAZON AGENT] Interaction failed: {e}")
+            logger.error("[AMAZON AGENT] Interaction failed: %s", e)
             # Last resort fallback: direct link
             driver.get(SEARCH_PATTERNS['amazon'].format(quote_plus(english_query)))
 
-        # 5. Extract Results
-        _handle_potential_captcha(driver) # Check again after search
-        
-        driver.execute_script("window.scrollBy(0, 1000);")
-        time.sleep(2)
-        
-        # Robust Selector for any product-like link
-        elements = driver.find_elements(By.TAG_NAME, "a")
-        for elem in elements:
-            try:
-                href = elem.get_attribute('href')
-                if href and ('/dp/' in href or '/gp/product/' in href):
-                    # Filter junk
-                    if 'customerReviews' in href or 'offer-listing' in href or 'signin' in href: continue
-                    
-                    if href.startswith("/"): href = "https://www.amazon.com" + href
-                    
-                    if '/dp/' in href:
-                        try:
-                            # Extract ASIN to clean URL
-                            base = href.split('/dp/')[1].split('/')[0].split('?')[0]
-                            clean = href.split('/dp/')[0] + '/dp/' + base
-                            links.add(clean)
-                        except: links.add(href)
-                    else:
-                        links.add(href)
-                        
-                    if len(links) >= MAX_SEARCH_RESULTS: break
-            except: continue
+        # 5. Extract Results, page by page
+        for page in range(1, depth + 1):
+            if page > 1:
+                # Prefer the on-page "Next" link (keeps Amazon's session params), else build the URL
+                try:
+                    driver.find_element(By.CSS_SELECTOR, "a.s-pagination-next").click()
+                except Exception:
+                    driver.get(_page_url('amazon', english_query, page))
+                time.sleep(random.uniform(2.0, 4.0))
+
+            _handle_potential_captcha(driver) # Check again after each navigation
+            driver.execute_script("window.scrollBy(0, 1000);")
+            time.sleep(2)
+
+            added = _offer_links(driver, AMAZON_RESULT_SELECTOR, 'amazon', frontier, queue, links)
+            logger.info("[AMAZON] Page %s: %s new links.", page, added)
+            if added == 0 or frontier.is_full('amazon'): break
 
     except Exception as e:
-        logger.error(f"[AMAZON] Search Error: {e}")
+        healthy = False
+        logger.error("[AMAZON] Search Error: %s", e)
     finally:
-        driver.quit()
+        release_driver("search", driver, healthy)
         
-    logger.info(f"[AMAZON] Found {len(links)} links.")
-    return list(links)
-
-def perform_search_and_queue(query: str, target_site: str) -> Queue:
-    links = []
-    if target_site == "digikala":
-        links = search_digikala(query)
-    elif target_site == "amazon":
-        links = search_amazon(query)
-    
-    q = Queue()
-    for link in links:
-        q.put(link)
-    return q
\ No newline at end of file
+    logger.info("[AMAZON] Found %s links.", len(links))
+    return links
+
+SEARCH_FUNCTIONS = {
+    "digikala": search_digikala,
+    "amazon": search_amazon,
+}
+
+def perform_search_and_queue(query: str, target_site: str, frontier: Optional[UrlFrontier] = None) -> CrawlQueue:
+    """
+    Starts searching `target_site` in the background and returns its crawl queue
+    right away. Links arrive page by page; the queue is closed when the search ends.
+    """
+    q = CrawlQueue()
+    search = SEARCH_FUNCTIONS.get(target_site)
+    if search is None:
+        q.close()
+        return q
+
+    def _producer():
+        try:
+            search(query, frontier or UrlFrontier(), q)
+        finally:
+            q.close()
+
+    threading.Thread(target=_producer, name=f"search-{target_site}", daemon=True).start()
+    return q
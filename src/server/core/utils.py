@@ -3,9 +3,11 @@ Utility functions for the server core.
 Currently handles translation services.
 """
 
-from deep_translator import GoogleTranslator
+from src.common.lazy import lazy_import
 from src.common.logger import setup_logger
 
+GoogleTranslator = lazy_import("deep_translator", "GoogleTranslator")
+
 logger = setup_logger(__name__)
 
 def translate_to_english(text: str) -> str:
@@ -29,10 +31,10 @@ def translate_to_english(text: str) -> str:
         return text
 
     try:
-        # logger.info(f"Translating query '{text}' to English...") # Optional verbosity
+        # logger.info("Translating query '%s' to English...", text) # Optional verbosity
         translated = GoogleTranslator(source='auto', target='en').translate(text)
-        logger.info(f"[TRANSLATE] '{text}' -> '{translated}'")
+        logger.info("[TRANSLATE] '%s' -> '%s'", text, translated)
         return translated
     except Exception as e:
-        logger.warning(f"[TRANSLATE] Failed: {e}. Using original query.")
+        logger.warning("[TRANSLATE] Failed: %s. Using original query.", e)
         return text
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Work Broker Module.
+
+TCP front end of the work queue. The SQLite file stays on the server's host;
+crawl workers on any host lease, heartbeat, complete and fail tasks through
+this endpoint instead of opening the database themselves.
+
+Protocol: one JSON object per line in each direction, e.g.
+    -> {"op": "lease", "worker": "host-123", "token": "..."}
+    <- {"task": {"id": 7, "job_id": "...", "site": "amazon", "url": "...", "attempts": 1},
+        "lease_seconds": 120}
+Errors are answered with {"error": "..."}.
+"""
+
+import json
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.logger import setup_logger
+from src.server.core.work_queue import QUEUE_DB, Task, WorkQueue
+from config.settings import ENCODING, WORK_BROKER_HOST, WORK_BROKER_PORT, WORK_BROKER_TOKEN
+
+logger = setup_logger(__name__)
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """Serves one worker connection; a worker keeps its connection open across tasks."""
+
+    def handle(self) -> None:
+        broker: "WorkBroker" = self.server.broker
+        for line in self.rfile:
+            try:
+                request = json.loads(line.decode(ENCODING))
+                reply = broker.dispatch(request) if isinstance(request, dict) else {'error': "Bad request"}
+            except ValueError as e:
+                reply = {'error': f"Bad request: {e}"}
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode(ENCODING))
+
+
+class _BrokerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class WorkBroker:
+    """
+    Serves a WorkQueue over TCP.
+
+    Requests from all worker connections are applied to the one queue
+    connection under a lock, so the workers never touch the SQLite file.
+    """
+
+    def __init__(self, work_queue: WorkQueue, host: str = WORK_BROKER_HOST, port: int = WORK_BROKER_PORT,
+                 token: str = WORK_BROKER_TOKEN):
+        self.work_queue = work_queue
+        self.token = token
+        self._lock = threading.Lock()
+        self._server = _BrokerServer((host, port), _BrokerHandler)
+        self._server.broker = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Applies one worker request to the queue and returns the reply."""
+        if self.token and request.get('token') != self.token:
+            return {'error': "Invalid token"}
+        op = request.get('op')
+        worker_id = request.get('worker')
+        if not isinstance(worker_id, str) or not worker_id:
+            return {'error': "Missing worker id"}
+
+        try:
+            with self._lock:
+                if op == 'lease':
+                    task = self.work_queue.lease(worker_id)
+                    return {'task': task._asdict() if task else None,
+                            'lease_seconds': self.work_queue.lease_seconds}
+                task = Task(**request['task'])
+                if op == 'complete':
+                    return {'ok': self.work_queue.complete(task, worker_id, request.get('records') or [])}
+                if op == 'fail':
+                    self.work_queue.fail(task, worker_id, str(request.get('error', '')))
+                    return {'ok': True}
+                if op == 'heartbeat':
+                    return {'ok': self.work_queue.heartbeat(task, worker_id)}
+        except (KeyError, TypeError) as e:
+            return {'error': f"Bad request: {e}"}
+        return {'error': f"Unknown op: {op}"}
+
+    def start(self) -> "WorkBroker":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="work-broker", daemon=True)
+        self._thread.start()
+        logger.info("[BROKER] Serving the work queue on %s:%s", *self.address)
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def start_work_broker() -> WorkBroker:
+    """Starts the broker for the server's default queue (distributed crawl mode)."""
+    return WorkBroker(WorkQueue(QUEUE_DB)).start()
+
+
+class RemoteWorkQueue:
+    """
+    Worker-side stand-in for WorkQueue that forwards lease / complete / fail /
+    heartbeat to a WorkBroker. A dropped connection is reopened once per call.
+    """
+
+    def __init__(self, address: Tuple[str, int] = (WORK_BROKER_HOST, WORK_BROKER_PORT),
+                 token: str = WORK_BROKER_TOKEN, timeout: float = 30):
+        self.address = address
+        self.token = token
+        self.timeout = timeout
+        self.lease_seconds: Optional[float] = None
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection(self.address, timeout=self.timeout)
+        self._file = self._sock.makefile('rb')
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._file = None
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        payload['token'] = self.token
+        data = (json.dumps(payload, ensure_ascii=False) + "\n").encode(ENCODING)
+        with self._lock:
+            for retry in (False, True):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(data)
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionError("Broker closed the connection")
+                    break
+                except OSError:
+                    self._disconnect()
+                    if retry:
+                        raise
+        reply = json.loads(line.decode(ENCODING))
+        if 'error' in reply:
+            raise RuntimeError(f"Work broker: {reply['error']}")
+        return reply
+
+    def lease(self, worker_id: str) -> Optional[Task]:
+        reply = self._request({'op': 'lease', 'worker': worker_id})
+        self.lease_seconds = reply.get('lease_seconds')
+        return Task(**reply['task']) if reply['task'] else None
+
+    def complete(self, task: Task, worker_id: str, records: List[Dict[str, Any]]) -> bool:
+        return self._request({'op': 'complete', 'worker': worker_id, 'task': task._asdict(),
+                              'records': records})['ok']
+
+    def fail(self, task: Task, worker_id: str, error: str) -> None:
+        self._request({'op': 'fail', 'worker': worker_id, 'task': task._asdict(), 'error': error})
+
+    def heartbeat(self, task: Task, worker_id: str) -> bool:
+        return self._request({'op': 'heartbeat', 'worker': worker_id, 'task': task._asdict()})['ok']
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
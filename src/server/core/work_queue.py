@@ -0,0 +1,186 @@
+"""
+Work Queue Module.
+
+A durable, SQLite-backed work queue shared by the server and crawl workers.
+The server publishes product URLs for a job; workers lease one task at a time,
+run the regular scraper on it and post the scraped records back. A lease that
+is not completed in time (crashed or stuck worker) expires and the task is
+handed to another worker, up to WORK_MAX_ATTEMPTS times.
+
+The SQLite file stays on the server's host (WAL mode needs a local disk, not a
+network file system). Workers on this or any other host reach it through the
+TCP front end in work_broker.py.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from src.common.logger import setup_logger
+from config.settings import WORK_QUEUE_PATH, WORK_LEASE_SECONDS, WORK_MAX_ATTEMPTS
+
+logger = setup_logger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+QUEUE_DB = BASE_DIR / WORK_QUEUE_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id      TEXT NOT NULL,
+    site        TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    result      TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, lease_until);
+CREATE INDEX IF NOT EXISTS idx_tasks_job ON tasks(job_id, status);
+"""
+
+
+class Task(NamedTuple):
+    id: int
+    job_id: str
+    site: str
+    url: str
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Lease-based task queue on top of a single SQLite file.
+
+    Publishing and leasing (read, then update) run in IMMEDIATE transactions;
+    complete, fail, heartbeat and cancel are single conditional UPDATEs, atomic
+    on their own. Any number of local processes can use the file concurrently.
+    """
+
+    def __init__(self, path: Path = QUEUE_DB, lease_seconds: float = WORK_LEASE_SECONDS,
+                 max_attempts: int = WORK_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def publish(self, job_id: str, site: str, urls: Iterable[str]) -> int:
+        """Adds one pending task per URL. Returns the number of tasks added."""
+        rows = [(job_id, site, url) for url in urls]
+        if rows:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany("INSERT INTO tasks (job_id, site, url) VALUES (?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+        return len(rows)
+
+    def lease(self, worker_id: str) -> Optional[Task]:
+        """
+        Claims the oldest pending (or lease-expired) task for this worker.
+        Tasks that ran out of attempts are marked failed instead of leased.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                row = self._db.execute(
+                    "SELECT id, job_id, site, url, attempts FROM tasks "
+                    "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                    "ORDER BY id LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                task = Task(*row)
+                if task.attempts >= self.max_attempts:
+                    self._db.execute(
+                        "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                        "WHERE id = ?", (task.id,)
+                    )
+                    continue
+                self._db.execute(
+                    "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, task.id)
+                )
+                self._db.execute("COMMIT")
+                return task._replace(attempts=task.attempts + 1)
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def complete(self, task: Task, worker_id: str, records: List[Dict[str, Any]]) -> bool:
+        """
+        Stores the scraped records of a task.
+        Ignored (returns False) if the lease was lost to another worker meanwhile.
+        """
+        cur = self._db.execute(
+            "UPDATE tasks SET status = 'done', result = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(records, ensure_ascii=False), task.id, worker_id)
+        )
+        return cur.rowcount == 1
+
+    def heartbeat(self, task: Task, worker_id: str) -> bool:
+        """
+        Extends the lease of a task the worker is still processing.
+        Returns False if the lease was lost to another worker meanwhile.
+        """
+        cur = self._db.execute(
+            "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, task.id, worker_id)
+        )
+        return cur.rowcount == 1
+
+    def fail(self, task: Task, worker_id: str, error: str) -> None:
+        """Releases a task for retry, or marks it failed once attempts are exhausted."""
+        status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+        self._db.execute(
+            "UPDATE tasks SET status = ?, error = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (status, error, task.id, worker_id)
+        )
+
+    def cancel(self, job_id: str) -> int:
+        """
+        Marks every pending or leased task of a job cancelled, e.g. after the server
+        stopped waiting for it. Late results of cancelled tasks are ignored.
+
+        Returns:
+            int: Number of tasks cancelled.
+        """
+        cur = self._db.execute(
+            "UPDATE tasks SET status = 'cancelled', lease_until = NULL "
+            "WHERE job_id = ? AND status IN ('pending', 'leased')", (job_id,)
+        )
+        return cur.rowcount
+
+    def job_status(self, job_id: str) -> Dict[str, int]:
+        """Task counts per status for a job."""
+        rows = self._db.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def is_finished(self, job_id: str) -> bool:
+        counts = self.job_status(job_id)
+        return counts.get('pending', 0) == 0 and counts.get('leased', 0) == 0
+
+    def results(self, job_id: str) -> List[Dict[str, Any]]:
+        """All records posted for a job, in publish order."""
+        records: List[Dict[str, Any]] = []
+        for (raw,) in self._db.execute(
+            "SELECT result FROM tasks WHERE job_id = ? AND status = 'done' ORDER BY id", (job_id,)
+        ):
+            records.extend(json.loads(raw))
+        return records
+
+    def close(self) -> None:
+        self._db.close()
@@ -2,21 +2,40 @@
 Main Server (Digikala vs Amazon Only).
 """
 
+import atexit
 import socket
 import os
 import json
-from src.common.logger import setup_logger
-from config.settings import SERVER_HOST, SERVER_PORT, BUFFER_SIZE, ENCODING
-from src.server.core.engine import run_crawler_threads
+import uuid
+from src.common.logger import enable_file_logging, setup_logger
+from config.settings import SERVER_HOST, SERVER_PORT, BUFFER_SIZE, ENCODING, CRAWL_MODE
+from src.server.core.engine import run_crawler_threads, run_distributed_crawl
 from src.server.core.data_manager import save_scraped_data_to_csv
-from src.server.core.analytics import analyze_purchase_options, generate_comparison_plot
+from src.server.core.analytics import build_purchase_report, save_purchase_report, generate_comparison_plot
+from src.server.core.report_index import ReportStore, run_report_query
 from src.server.core.search_engine import perform_search_and_queue
+from src.server.core.frontier import UrlFrontier
+from src.server.core.records import RecordBatch
 
 from src.server.core.scrapers.digikala import scrape_digikala_product_details
 from src.server.core.scrapers.amazon import scrape_amazon_product_details
 
 logger = setup_logger(__name__)
 
+# Ranked reports of recent jobs, queried by clients with {"action": "query", ...}
+REPORTS = ReportStore()
+
+def crawl_site(site: str, query: str, scraper, result_list: RecordBatch, frontier: UrlFrontier) -> None:
+    """
+    Searches a site and scrapes its product links, in-process or via the worker queue.
+    Scraping starts on the first result page while later pages are still loading.
+    """
+    url_queue = perform_search_and_queue(query, site, frontier)
+    if CRAWL_MODE == 'distributed':
+        run_distributed_crawl(site, url_queue, result_list)
+    else:
+        run_crawler_threads(scraper, url_queue, result_list)
+
 def handle_client_connection(conn: socket.socket) -> None:
     try:
         raw_data = conn.recv(BUFFER_SIZE).decode(ENCODING)
@@ -26,27 +45,36 @@ def handle_client_connection(conn: socket.socket) -> None:
         except:
             return
 
+        if client_request.get("action") == "query":
+            result = run_report_query(REPORTS, client_request)
+            conn.sendall((json.dumps(result, ensure_ascii=False) + "\n").encode(ENCODING))
+            return
+
         conn.send(f"ACK: Comparing Prices for '{search_query}'...".encode(ENCODING))
         
+        frontier = UrlFrontier()
+
         # 1. Digikala
-        list_digikala = []
-        q_digikala = perform_search_and_queue(search_query, "digikala")
-        run_crawler_threads(scrape_digikala_product_details, q_digikala, list_digikala)
-        save_scraped_data_to_csv(list_digikala, "digikala.csv")
+        batch_digikala = RecordBatch()
+        crawl_site("digikala", search_query, scrape_digikala_product_details, batch_digikala, frontier)
+        df_digikala = save_scraped_data_to_csv(batch_digikala, "digikala.csv")
 
         # 2. Amazon
-        list_amazon = []
-        q_amazon = perform_search_and_queue(search_query, "amazon")
-        run_crawler_threads(scrape_amazon_product_details, q_amazon, list_amazon)
-        save_scraped_data_to_csv(list_amazon, "amazon.csv")
+        batch_amazon = RecordBatch()
+        crawl_site("amazon", search_query, scrape_amazon_product_details, batch_amazon, frontier)
+        df_amazon = save_scraped_data_to_csv(batch_amazon, "amazon.csv")
         
         # 3. Analyze
         logger.info("--- Analyzing & Comparing ---")
-        report_path = analyze_purchase_options()
+        report_df = build_purchase_report({"digikala": df_digikala, "amazon": df_amazon})
+        report_path = save_purchase_report(report_df)
         plot_path = generate_comparison_plot()
         
         if report_path:
-            conn.send(report_path.encode(ENCODING))
+            job_id = uuid.uuid4().hex[:12]
+            REPORTS.put(job_id, report_df.to_dict('records'))
+            job_info = {"job_id": job_id, "report_path": report_path, "rows": len(report_df)}
+            conn.send(json.dumps(job_info).encode(ENCODING))
         else:
             conn.send("ERROR: Analysis failed.".encode(ENCODING))
             return
@@ -58,16 +86,53 @@ def handle_client_connection(conn: socket.socket) -> None:
                 conn.sendall(f.read())
         
     except Exception as e:
-        logger.error(f"Server Error: {e}")
+        logger.error("Server Error: %s", e)
     finally:
         conn.close()
 
-def start_server_app() -> None:
+def prewarm_service() -> None:
+    """
+    Does the one-time work of a request up front: imports the heavy modules,
+    starts pooled browsers and fetches the FX rate.
+    """
+    from src.common.lazy import lazy_import
+    from src.server.core import analytics, finance, search_engine
+    from src.server.core.browser import prewarm_drivers, shutdown_driver_pool
+    from src.server.core.scrapers.amazon import create_amazon_driver
+    from src.server.core.scrapers.digikala import create_digikala_driver
+    from config.settings import SERVICE_PREWARM_BROWSERS
+
+    logger.info("[SERVICE] Prewarming...")
+    for proxy in (analytics.pd, analytics.plt, finance.requests, search_engine.webdriver,
+                  lazy_import("bs4"), lazy_import("deep_translator")):
+        proxy.load()
+    analytics.plt.switch_backend('Agg')
+
+    atexit.register(shutdown_driver_pool)
+    prewarm_drivers("search", search_engine.create_search_driver, SERVICE_PREWARM_BROWSERS)
+    prewarm_drivers("digikala", create_digikala_driver, SERVICE_PREWARM_BROWSERS)
+    prewarm_drivers("amazon", create_amazon_driver, SERVICE_PREWARM_BROWSERS)
+
+    finance.get_current_usd_rate()
+    logger.info("[SERVICE] Ready to serve without per-request start-up.")
+
+def start_server_app(preload: bool = False) -> None:
+    enable_file_logging("server")
+    if preload:
+        prewarm_service()
+    if CRAWL_MODE == 'distributed':
+        from src.server.core.work_broker import start_work_broker
+        start_work_broker()
+
     server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server.bind((SERVER_HOST, SERVER_PORT))
     server.listen(1)
-    logger.info(f"Server Ready on {SERVER_HOST}:{SERVER_PORT}")
+    logger.info("Server Ready on %s:%s", SERVER_HOST, SERVER_PORT)
     
     while True:
         conn, _ = server.accept()
-        handle_client_connection(conn)
\ No newline at end of file
+        handle_client_connection(conn)
+
+def start_service_app() -> None:
+    """Long-running service mode: prewarm once, then serve every request warm."""
+    start_server_app(preload=True)
\ No newline at end of file
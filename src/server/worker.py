@@ -0,0 +1,132 @@
+"""
+Crawl Worker.
+
+Standalone process that leases product URLs from the server's work broker, runs
+the regular scraper on each one and posts the records back to the server's job.
+Workers only need TCP access to the server, so they can run on any number of
+hosts; see worker.py at the project root.
+"""
+
+import os
+import socket
+import threading
+import time
+from queue import Queue
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.common.logger import enable_file_logging, setup_logger
+from src.server.core.records import ProductRecord
+from src.server.core.work_broker import RemoteWorkQueue
+from src.server.core.work_queue import Task
+from config.settings import WORK_BROKER_HOST, WORK_BROKER_PORT, WORK_BROKER_TOKEN, WORKER_POLL_INTERVAL
+
+logger = setup_logger(__name__)
+
+
+# scraper(url_queue, result_list, failures): failed URLs are appended to `failures`
+Scraper = Callable[[Queue, List[ProductRecord], List[str]], None]
+
+
+def _load_scrapers() -> Dict[str, Scraper]:
+    from src.server.core.scrapers.digikala import scrape_digikala_product_details
+    from src.server.core.scrapers.amazon import scrape_amazon_product_details
+    return {
+        "digikala": scrape_digikala_product_details,
+        "amazon": scrape_amazon_product_details,
+    }
+
+
+def _keep_lease(work_queue: RemoteWorkQueue, task: Task, worker_id: str, stop: threading.Event) -> None:
+    # Renews the lease while a slow page is still being scraped
+    interval = (work_queue.lease_seconds or 60) / 3
+    while not stop.wait(interval):
+        try:
+            if not work_queue.heartbeat(task, worker_id):
+                return
+        except (OSError, RuntimeError) as e:
+            logger.warning("[WORKER %s] Heartbeat for task %s failed: %s", worker_id, task.id, e)
+
+
+def run_worker(worker_id: Optional[str] = None, max_idle: Optional[float] = None,
+               scrapers: Optional[Dict[str, Scraper]] = None,
+               address: Tuple[str, int] = (WORK_BROKER_HOST, WORK_BROKER_PORT),
+               token: str = WORK_BROKER_TOKEN, poll_interval: float = WORKER_POLL_INTERVAL) -> int:
+    """
+    Processes tasks until stopped.
+
+    Args:
+        worker_id (str): Name recorded on leased tasks. Defaults to host-pid.
+        max_idle (float): Exit after this many seconds without work (None = run forever).
+        scrapers (Dict): site -> scraper function, defaults to the built-in scrapers.
+        address (Tuple): (host, port) of the server's work broker.
+        token (str): Shared secret expected by the broker.
+        poll_interval (float): Seconds to sleep while the queue is empty.
+
+    Returns:
+        int: Number of tasks completed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    scrapers = scrapers or _load_scrapers()
+    work_queue = RemoteWorkQueue(address, token)
+    done = 0
+    idle_since = time.monotonic()
+    logger.info("[WORKER %s] Ready.", worker_id)
+
+    try:
+        while True:
+            try:
+                task = work_queue.lease(worker_id)
+            except OSError as e:
+                # Server not up yet or restarting: keep polling like an empty queue
+                logger.warning("[WORKER %s] Broker %s:%s unreachable: %s", worker_id, *address, e)
+                task = None
+            if task is None:
+                if max_idle is not None and time.monotonic() - idle_since > max_idle:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            # Same call the in-process engine makes, with a single-URL queue
+            url_queue: Queue = Queue()
+            url_queue.put(task.url)
+            records: List[ProductRecord] = []
+            failures: List[str] = []
+            stop_heartbeat = threading.Event()
+            threading.Thread(target=_keep_lease, args=(work_queue, task, worker_id, stop_heartbeat),
+                             daemon=True).start()
+            try:
+                scrapers[task.site](url_queue, records, failures)
+            except Exception as e:
+                logger.error("[WORKER %s] Task %s failed: %s", worker_id, task.id, e)
+                work_queue.fail(task, worker_id, str(e))
+            else:
+                if failures or not records:
+                    # Scrapers log and swallow page errors; retry until WORK_MAX_ATTEMPTS
+                    logger.warning("[WORKER %s] Task %s yielded no record (attempt %s).",
+                                   worker_id, task.id, task.attempts)
+                    work_queue.fail(task, worker_id, "no record scraped")
+                elif work_queue.complete(task, worker_id, [r.to_dict() for r in records]):
+                    done += 1
+                else:
+                    logger.warning("[WORKER %s] Lease on task %s was lost; result dropped.", worker_id, task.id)
+            finally:
+                stop_heartbeat.set()
+            idle_since = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        work_queue.close()
+
+    logger.info("[WORKER %s] Stopping after %s tasks.", worker_id, done)
+    return done
+
+
+def start_worker_app(broker: Optional[str] = None) -> None:
+    """
+    Args:
+        broker (str): 'host' or 'host:port' of the server's work broker,
+            defaults to WORK_BROKER_HOST / WORK_BROKER_PORT.
+    """
+    enable_file_logging(f"worker-{os.getpid()}")
+    host, _, port = (broker or WORK_BROKER_HOST).partition(':')
+    run_worker(address=(host, int(port) if port else WORK_BROKER_PORT))
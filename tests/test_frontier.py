@@ -0,0 +1,91 @@
+"""
+URL frontier: canonicalization, deduplication and the streaming crawl queue.
+"""
+
+import threading
+import time
+from queue import Queue
+
+from src.server.core.frontier import CrawlQueue, UrlFrontier, canonicalize_product_url, iter_urls
+
+
+def test_amazon_url_variants_share_the_asin():
+    expected = ("B09G9HD6PD", "https://www.amazon.com/dp/B09G9HD6PD")
+    for url in (
+        "https://www.amazon.com/dp/B09G9HD6PD",
+        "https://www.amazon.com/dp/B09G9HD6PD?th=1",
+        "https://www.amazon.com/Apple-iPhone-13-Pro/dp/B09G9HD6PD/ref=sr_1_3?keywords=iphone",
+        "https://www.amazon.com/gp/product/B09G9HD6PD/",
+        "/Apple-iPhone-13-Pro/dp/B09G9HD6PD#reviews",
+    ):
+        assert canonicalize_product_url("amazon", url) == expected, url
+
+
+def test_digikala_url_variants_share_the_dkp_id():
+    expected = ("dkp-7654321", "https://www.digikala.com/product/dkp-7654321/")
+    for url in (
+        "https://www.digikala.com/product/dkp-7654321/",
+        "https://www.digikala.com/product/dkp-7654321/%DA%AF%D9%88%D8%B4%DB%8C-apple/",
+        "https://www.digikala.com/product/dkp-7654321/?variant=123",
+    ):
+        assert canonicalize_product_url("digikala", url) == expected, url
+
+
+def test_non_product_links_are_rejected():
+    assert canonicalize_product_url("amazon", "https://www.amazon.com/s?k=iphone") is None
+    assert canonicalize_product_url("amazon", "https://www.digikala.com/product/dkp-1/") is None
+    assert canonicalize_product_url("digikala", "https://www.digikala.com/search/?q=iphone") is None
+    assert canonicalize_product_url("amazon", None) is None
+
+
+def test_frontier_dedups_and_caps_per_site():
+    frontier = UrlFrontier(max_per_site=2)
+    queue: Queue = Queue()
+
+    assert frontier.offer("amazon", "https://www.amazon.com/dp/B000000001?th=1", queue)
+    assert frontier.offer("amazon", "https://www.amazon.com/x/dp/B000000001/ref=sr", queue) is None
+    assert frontier.offer("amazon", "https://www.amazon.com/gp/product/B000000002", queue)
+    assert frontier.is_full("amazon")
+    assert frontier.offer("amazon", "https://www.amazon.com/dp/B000000003", queue) is None
+    # The cap is per site
+    assert frontier.offer("digikala", "https://www.digikala.com/product/dkp-1/", queue)
+
+    assert list(iter_urls(queue)) == [
+        "https://www.amazon.com/dp/B000000001",
+        "https://www.amazon.com/dp/B000000002",
+        "https://www.digikala.com/product/dkp-1/",
+    ]
+    assert frontier.count("amazon") == 2 and frontier.count("digikala") == 1
+
+
+def test_consumers_racing_for_the_last_item_all_finish():
+    queue: Queue = Queue()
+    queue.put("https://www.amazon.com/dp/B000000001")
+    consumed = []
+    threads = [threading.Thread(target=lambda: consumed.extend(iter_urls(queue))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert not any(t.is_alive() for t in threads)
+    assert consumed == ["https://www.amazon.com/dp/B000000001"]
+
+
+def test_crawl_queue_consumer_waits_until_closed():
+    queue = CrawlQueue()
+    consumed = []
+    consumer = threading.Thread(target=lambda: consumed.extend(iter_urls(queue, poll_interval=0.02)))
+    consumer.start()
+
+    time.sleep(0.1)
+    assert consumer.is_alive()  # empty but still open: the search may add more
+    queue.put("https://www.amazon.com/dp/B000000001")
+    time.sleep(0.1)
+    assert consumer.is_alive()
+
+    queue.put("https://www.amazon.com/dp/B000000002")
+    queue.close()
+    consumer.join(timeout=5)
+    assert not consumer.is_alive()
+    assert consumed == ["https://www.amazon.com/dp/B000000001", "https://www.amazon.com/dp/B000000002"]
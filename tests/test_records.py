@@ -0,0 +1,42 @@
+"""
+RecordBatch: columnar storage and zero-copy DataFrame conversion.
+"""
+
+import pytest
+
+from src.server.core.records import CSV_COLUMNS, ProductRecord, RecordBatch
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+
+def _batch() -> RecordBatch:
+    return RecordBatch(
+        ProductRecord("amazon", f"B{i:09d}", f"Product {i}", 100.0 + i, "USD",
+                      f"https://www.amazon.com/dp/B{i:09d}", 1_700_000_000.0 + i)
+        for i in range(50)
+    )
+
+
+def test_to_dataframe_shares_numeric_buffers():
+    batch = _batch()
+    df = batch.to_dataframe()
+
+    assert list(df.columns) == CSV_COLUMNS
+    assert np.shares_memory(df['final_price'].to_numpy(), np.frombuffer(batch._prices))
+    assert np.shares_memory(df['scraped_at'].to_numpy(), np.frombuffer(batch._timestamps))
+    assert df['final_price'].iloc[7] == 107.0
+
+
+def test_batch_is_frozen_after_conversion():
+    batch = _batch()
+    batch.to_dataframe()
+    with pytest.raises(RuntimeError):
+        batch.append(next(iter(batch)))
+
+
+def test_iteration_round_trips_records():
+    records = list(_batch())
+    assert len(records) == 50
+    assert records[3] == ProductRecord("amazon", "B000000003", "Product 3", 103.0, "USD",
+                                       "https://www.amazon.com/dp/B000000003", 1_700_000_003.0)
@@ -0,0 +1,72 @@
+"""
+Ranked report queries: price bounds, filters, pagination and the LRU store.
+"""
+
+from src.server.core.report_index import RankedReport, ReportStore, run_report_query
+
+ROWS = [
+    {'product_name': 'Apple iPhone 13 Pro', 'final_price': 700, 'source': 'Amazon (Imported)'},
+    {'product_name': 'Apple iPhone 13', 'final_price': 500, 'source': 'Digikala'},
+    {'product_name': 'Samsung Galaxy S21', 'final_price': 400, 'source': 'Amazon (Imported)'},
+    {'product_name': 'Apple iPhone 13 Mini', 'final_price': 600, 'source': 'Amazon (Imported)'},
+    {'product_name': 'Apple iPhone 12', 'final_price': 300, 'source': 'Digikala'},
+    {'product_name': 'Xiaomi Redmi Note', 'final_price': 500, 'source': 'Amazon (Imported)'},
+]
+
+
+def _prices(result):
+    return [row['final_price'] for row in result['rows']]
+
+
+def test_price_bounds_are_inclusive():
+    report = RankedReport(ROWS)
+    assert _prices(report.query(min_price=400, max_price=600)) == [400, 500, 500, 600]
+    assert _prices(report.query(min_price=500, max_price=500)) == [500, 500]
+    assert report.query(min_price=301, max_price=399)['total'] == 0
+
+
+def test_source_and_text_intersection_stays_in_price_order():
+    report = RankedReport(ROWS)
+    result = report.query(source='amazon', text='iphone 13')
+    assert [row['product_name'] for row in result['rows']] == ['Apple iPhone 13 Mini', 'Apple iPhone 13 Pro']
+    assert _prices(report.query(source='AMAZON', text='apple', max_price=650)) == [600]
+
+
+def test_page_offsets():
+    report = RankedReport(ROWS)
+    first = report.page(1, page_size=4)
+    second = report.page(2, page_size=4)
+    assert (first['offset'], second['offset']) == (0, 4)
+    assert _prices(first) == [300, 400, 500, 500]
+    assert _prices(second) == [600, 700]
+    assert first['total'] == second['total'] == len(ROWS)
+    assert report.page(3, page_size=4)['rows'] == []
+
+
+def test_store_evicts_least_recently_used():
+    store = ReportStore(capacity=2)
+    store.put('a', ROWS)
+    store.put('b', ROWS)
+    assert store.get('a') is not None  # 'b' is now the least recently used
+    store.put('c', ROWS)
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+
+
+def test_bad_input_gets_error_reply():
+    store = ReportStore()
+    store.put('job', ROWS)
+
+    for request in (
+        {'job_id': ['job']},
+        {'job_id': {'id': 'job'}},
+        {'job_id': 'missing'},
+        {'job_id': 'job', 'op': 'top', 'n': 'many'},
+        {'job_id': 'job', 'min_price': 'cheap'},
+        {'job_id': 'job', 'op': 'sort'},
+    ):
+        assert 'error' in run_report_query(store, request), request
+
+    result = run_report_query(store, {'job_id': 'job', 'op': 'top', 'n': 2, 'source': 42})
+    assert result == {'total': 0, 'offset': 0, 'rows': [], 'job_id': 'job'}
+    assert _prices(run_report_query(store, {'job_id': 'job', 'op': 'top', 'n': 2})) == [300, 400]
@@ -0,0 +1,141 @@
+"""
+Distributed crawl: several worker processes draining one work queue through the broker.
+"""
+
+import multiprocessing
+import sqlite3
+import time
+from queue import Queue
+from typing import List, Optional
+
+import pytest
+
+from src.server.core.engine import run_crawler_threads, run_distributed_crawl
+from src.server.core.frontier import iter_urls
+from src.server.core.records import ProductRecord
+from src.server.core.work_broker import RemoteWorkQueue, WorkBroker
+from src.server.core.work_queue import WorkQueue
+from src.server.worker import run_worker
+from config.settings import WORK_MAX_ATTEMPTS
+
+TOKEN = "test-token"
+
+GOOD_URLS = [f"https://www.amazon.com/dp/B{i:09d}" for i in range(12)]
+BAD_URL = "https://www.amazon.com/dp/BBROKEN000"
+
+
+def stub_amazon_scraper(queue: Queue, result_list: List[ProductRecord],
+                        failures: Optional[List[str]] = None) -> None:
+    """Stands in for the Selenium scraper: every URL but BAD_URL yields a record."""
+    for url in iter_urls(queue):
+        time.sleep(0.05)  # long enough for the other workers to lease tasks too
+        if url == BAD_URL:
+            if failures is not None:
+                failures.append(url)
+            continue
+        result_list.append(ProductRecord.from_page("amazon", url, f"Product {url[-4:]}", 10.0 + int(url[-2:]), "USD"))
+
+
+def _fill_queue() -> Queue:
+    url_queue: Queue = Queue()
+    for url in GOOD_URLS + [BAD_URL]:
+        url_queue.put(url)
+    return url_queue
+
+
+def _offer(record: ProductRecord) -> tuple:
+    return record.site, record.canonical_id, record.title, record.price, record.currency, record.url
+
+
+@pytest.fixture
+def broker(tmp_path):
+    broker = WorkBroker(WorkQueue(tmp_path / "work_queue.sqlite"), "127.0.0.1", 0, token=TOKEN).start()
+    yield broker
+    broker.stop()
+    broker.work_queue.close()
+
+
+def test_workers_drain_job_and_retry_failures(broker):
+    queue_path = broker.work_queue.path
+    # Spawned, not forked: the workers share nothing with this process but the broker address
+    spawn = multiprocessing.get_context("spawn")
+    workers = [
+        spawn.Process(target=run_worker, kwargs={
+            "worker_id": f"test-{i}",
+            "max_idle": 3.0,
+            "scrapers": {"amazon": stub_amazon_scraper},
+            "address": broker.address,
+            "token": TOKEN,
+            "poll_interval": 0.05,
+        })
+        for i in range(3)
+    ]
+    for w in workers:
+        w.start()
+
+    distributed: List[ProductRecord] = []
+    try:
+        run_distributed_crawl("amazon", _fill_queue(), distributed, job_id="job-1", timeout=60,
+                              queue_path=queue_path, poll_interval=0.05)
+    finally:
+        for w in workers:
+            w.join(timeout=30)
+    assert all(w.exitcode == 0 for w in workers)
+
+    db = sqlite3.connect(str(queue_path))
+    rows = {url: (status, attempts) for url, status, attempts in
+            db.execute("SELECT url, status, attempts FROM tasks WHERE job_id = 'job-1'")}
+    workers_used = {w for (w,) in db.execute("SELECT DISTINCT worker FROM tasks")}
+    db.close()
+
+    assert all(rows[url] == ('done', 1) for url in GOOD_URLS)
+    assert rows[BAD_URL] == ('failed', WORK_MAX_ATTEMPTS)
+    assert len(workers_used) >= 2
+
+    in_process: List[ProductRecord] = []
+    run_crawler_threads(stub_amazon_scraper, _fill_queue(), in_process)
+    assert sorted(map(_offer, distributed)) == sorted(map(_offer, in_process))
+
+
+def test_timed_out_job_is_cancelled(broker):
+    queue_path = broker.work_queue.path
+    results: List[ProductRecord] = []
+    run_distributed_crawl("amazon", _fill_queue(), results, job_id="job-2", timeout=0.2,
+                          queue_path=queue_path, poll_interval=0.05)
+    assert results == []
+
+    # Nothing is left for a worker that starts late
+    assert run_worker(max_idle=0, scrapers={"amazon": stub_amazon_scraper},
+                      address=broker.address, token=TOKEN, poll_interval=0.05) == 0
+    db = sqlite3.connect(str(queue_path))
+    statuses = {s for (s,) in db.execute("SELECT status FROM tasks WHERE job_id = 'job-2'")}
+    db.close()
+    assert statuses == {'cancelled'}
+
+
+def test_broker_rejects_bad_token_and_renews_leases(broker):
+    queue_path = broker.work_queue.path
+    WorkQueue(queue_path).publish("job-3", "amazon", GOOD_URLS[:1])
+
+    with pytest.raises(RuntimeError, match="Invalid token"):
+        RemoteWorkQueue(broker.address, token="wrong").lease("w1")
+
+    remote = RemoteWorkQueue(broker.address, token=TOKEN)
+    try:
+        task = remote.lease("w1")
+        assert task.url == GOOD_URLS[0] and remote.lease_seconds == broker.work_queue.lease_seconds
+        assert remote.lease("w2") is None
+
+        db = sqlite3.connect(str(queue_path))
+        before = db.execute("SELECT lease_until FROM tasks WHERE id = ?", (task.id,)).fetchone()[0]
+        time.sleep(0.05)
+        assert remote.heartbeat(task, "w1")
+        assert not remote.heartbeat(task, "w2")
+        after = db.execute("SELECT lease_until FROM tasks WHERE id = ?", (task.id,)).fetchone()[0]
+        db.close()
+        assert after > before
+
+        assert remote.complete(task, "w1", [])
+        assert not remote.heartbeat(task, "w1")
+    finally:
+        remote.close()
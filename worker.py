@@ -0,0 +1,14 @@
+import sys
+import os
+
+# اضافه کردن مسیر فعلی به مسیرهای پایتون تا پکیج‌ها شناخته شوند
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+def main():
+    print("Starting Crawl Worker (Ctrl+C to stop)...")
+    from src.server.worker import start_worker_app
+    # Optional broker address of a server on another host: python worker.py 10.0.0.5[:9081]
+    start_worker_app(sys.argv[1] if len(sys.argv) > 1 else None)
+
+if __name__ == "__main__":
+    main()